@@ -4,7 +4,13 @@ Simple pagination
 """
 import csv
 import math
-from typing import List
+import threading
+from itertools import islice
+from typing import Callable, List, Dict, Sequence, Iterator
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+MappedCSVDataset = __import__('row_index').MappedCSVDataset
+load_dataset = __import__('snapshot').load_dataset
+QueryIndex = __import__('query_index').QueryIndex
 
 
 def index_range(page, page_size):
@@ -22,22 +28,60 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, row_index: bool = False, snapshot: bool = True,
+                 warm_up: bool = False, memoize: Callable = None):
+        """row_index: parse only the requested rows through a
+        memory-mapped row-offset index instead of loading the file
+        snapshot: map a binary snapshot of the parsed dataset, written
+        on first load, instead of parsing the file again
+        warm_up: start loading in a background thread right away
+        memoize: decorator applied to this server's get_page,
+        e.g. cached(capacity=1024) from 0x01-caching; the dataset never
+        changes, so results can be reused until evicted
+        """
+        self.__lock = threading.RLock()
+        self.__row_index = row_index
+        self.__snapshot = snapshot
         self.__dataset = None
+        self.__query_index = None
+        if memoize is not None:
+            self.get_page = memoize(self.get_page)
+        if warm_up:
+            threading.Thread(target=self.dataset, daemon=True).start()
 
-    def dataset(self) -> List[List]:
-        """Cached dataset
+    def dataset(self) -> Sequence[List]:
+        """Cached dataset; concurrent first calls share a single load
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            with self.__lock:
+                if self.__dataset is None:
+                    if self.__row_index:
+                        dataset = MappedCSVDataset(self.DATA_FILE)
+                    elif self.__snapshot:
+                        dataset = load_dataset(self.DATA_FILE)
+                    else:
+                        dataset = ColumnarDataset.from_csv(self.DATA_FILE)
+                    self.__dataset = dataset
 
         return self.__dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
-        """Returns a page of data from the dataset
+    def query_index(self) -> QueryIndex:
+        """Secondary indexes over the dataset, built on first use
+        """
+        if self.__query_index is None:
+            with self.__lock:
+                if self.__query_index is None:
+                    dataset = self.dataset()
+                    if not isinstance(dataset, ColumnarDataset):
+                        dataset = ColumnarDataset.from_csv(self.DATA_FILE)
+                    self.__query_index = QueryIndex(dataset)
+        return self.__query_index
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filter: Dict = None, order_by: str = None) -> List[List]:
+        """Returns a page of data from the dataset, optionally restricted
+        to rows whose columns equal the values in `filter` and sorted
+        by the `order_by` column ('-' prefix for descending order)
         """
         assert isinstance(page, int) and page > 0, \
             "Page must be a positive integer"
@@ -46,6 +90,59 @@ class Server:
 
         start, end = index_range(page, page_size)
         data = self.dataset()
+        if filter or order_by:
+            row_ids = self.query_index().row_ids(start, end, filter, order_by)
+            return [data[i] for i in row_ids]
         if start >= len(data):
             return []
         return data[start: end]
+
+    def _rows(self) -> Iterator[List]:
+        """Lazily yield the rows of the data file, header excluded
+        """
+        with open(self.DATA_FILE) as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            yield from reader
+
+    def get_page_streaming(self, page: int = 1,
+                           page_size: int = 10) -> List[List]:
+        """Same as get_page, but reads the data file lazily instead of
+        loading the dataset: at most one page is held in memory
+        """
+        assert isinstance(page, int) and page > 0, \
+            "Page must be a positive integer"
+        assert isinstance(page_size, int) and page_size > 0, \
+            "Page size must be a positive integer"
+
+        start, end = index_range(page, page_size)
+        rows = self._rows()
+        try:
+            return list(islice(rows, start, end))
+        finally:
+            rows.close()
+
+    def iter_pages(self, page_size: int = 10) -> Iterator[List[List]]:
+        """Yields every page of the data file in order, in a single
+        lazy pass; at most one page is held in memory
+        """
+        assert isinstance(page_size, int) and page_size > 0, \
+            "Page size must be a positive integer"
+
+        return self._iter_pages(page_size)
+
+    def _iter_pages(self, page_size: int) -> Iterator[List[List]]:
+        """Generator behind iter_pages
+        """
+        rows = self._rows()
+        page = 1
+        try:
+            while True:
+                start, end = index_range(page, page_size)
+                data = list(islice(rows, end - start))
+                if not data:
+                    return
+                yield data
+                page += 1
+        finally:
+            rows.close()
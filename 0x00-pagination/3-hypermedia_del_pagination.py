@@ -3,9 +3,15 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
 import math
-from typing import List, Dict
+import threading
+from typing import List, Dict, Sequence
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+MappedCSVDataset = __import__('row_index').MappedCSVDataset
+load_dataset = __import__('snapshot').load_dataset
+IndexedDataset = __import__('indexed_dataset').IndexedDataset
+encode_cursor = __import__('cursor').encode_cursor
+decode_cursor = __import__('cursor').decode_cursor
 
 
 class Server:
@@ -13,49 +19,72 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, row_index: bool = False, snapshot: bool = True,
+                 warm_up: bool = False):
+        """row_index: parse only the requested rows through a
+        memory-mapped row-offset index instead of loading the file
+        snapshot: map a binary snapshot of the parsed dataset, written
+        on first load, instead of parsing the file again
+        warm_up: start loading in a background thread right away
+        """
+        self.__lock = threading.RLock()
+        self.__row_index = row_index
+        self.__snapshot = snapshot
         self.__dataset = None
         self.__indexed_dataset = None
+        if warm_up:
+            threading.Thread(target=self.indexed_dataset, daemon=True).start()
 
-    def dataset(self) -> List[List]:
-        """Cached dataset
+    def dataset(self) -> Sequence[List]:
+        """Cached dataset; concurrent first calls share a single load
         """
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]
+            with self.__lock:
+                if self.__dataset is None:
+                    if self.__row_index:
+                        dataset = MappedCSVDataset(self.DATA_FILE)
+                    elif self.__snapshot:
+                        dataset = load_dataset(self.DATA_FILE)
+                    else:
+                        dataset = ColumnarDataset.from_csv(self.DATA_FILE)
+                    self.__dataset = dataset
 
         return self.__dataset
 
-    def indexed_dataset(self) -> Dict[int, List]:
+    def indexed_dataset(self) -> IndexedDataset:
         """Dataset indexed by sorting position, starting at 0
         """
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            truncated_dataset = dataset[:1000]
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            with self.__lock:
+                if self.__indexed_dataset is None:
+                    self.__indexed_dataset = IndexedDataset(self.dataset())
         return self.__indexed_dataset
 
+    def delete(self, index: int) -> None:
+        """Delete the row at `index`; other rows keep their index
+        """
+        self.indexed_dataset().delete(index)
+
+    def insert(self, row: List, index: int = None) -> int:
+        """Store `row` at a free `index` (default: after the last one)
+        and return the index it was stored at
+        """
+        return self.indexed_dataset().insert(row, index)
+
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
         """Deletion-resilient hypermedia pagination
         return a dictionary of hypermedia metadata resilient to deletion
         """
         indexed_data = self.indexed_dataset()
-        dataset_size = len(indexed_data)
-        assert index is not None and 0 <= index < dataset_size
-        current_index = index
-        data = []
+        assert index is not None and 0 <= index < indexed_data.bound
+        indexes = indexed_data.page(index, page_size)
+        data = indexed_data.rows(indexes)
 
-        while len(data) < page_size and current_index < dataset_size:
-            item = indexed_data.get(current_index)
-            if item:
-                data.append(item)
-            current_index += 1
-
-        next_index = current_index if current_index < dataset_size else None
+        next_index = None
+        if len(data) == page_size:
+            next_index = indexes[-1] + 1 if indexes else index
+            if next_index >= indexed_data.bound:
+                next_index = None
 
         return {
             "index": index,
@@ -63,3 +92,41 @@ class Server:
             "page_size": len(data),
             "next_index": next_index
         }
+
+    def _cursor_at(self, position: int) -> str:
+        """Cursor pointing at the live row at `position`, if any
+        """
+        indexed_data = self.indexed_dataset()
+        index = indexed_data.index_at(position)
+        if index is None:
+            return None
+        return encode_cursor(indexed_data.generation, index, position)
+
+    def get_hyper_cursor(self, cursor: str = None,
+                         page_size: int = 10) -> Dict:
+        """Cursor-based, deletion-resilient hypermedia pagination.
+        A cursor from the current dataset generation resumes in O(1);
+        an older one falls back to a bisect on the row index it holds
+        """
+        assert isinstance(page_size, int) and page_size > 0, \
+            "Page size must be a positive integer"
+        indexed_data = self.indexed_dataset()
+        position = 0
+        if cursor is not None:
+            decoded = decode_cursor(cursor)
+            assert decoded is not None, "Invalid cursor"
+            generation, index, position = decoded
+            if (generation != indexed_data.generation
+                    or indexed_data.index_at(position) != index):
+                position = indexed_data.locate(index)
+        indexes = indexed_data.window(position, page_size)
+        data = indexed_data.rows(indexes)
+
+        return {
+            "cursor": cursor,
+            "data": data,
+            "page_size": len(data),
+            "next_cursor": self._cursor_at(position + len(indexes)),
+            "prev_cursor": (self._cursor_at(max(position - page_size, 0))
+                            if position > 0 else None)
+        }
@@ -18,7 +18,7 @@ except AssertionError:
 index = 3
 page_size = 2
 
-print("Nb items: {}".format(len(server._Server__indexed_dataset)))
+print("Nb items: {}".format(len(server.indexed_dataset())))
 
 # 1- request first index
 res = server.get_hyper_index(index, page_size)
@@ -28,8 +28,8 @@ print(res)
 print(server.get_hyper_index(res.get('next_index'), page_size))
 
 # 3- remove the first index
-del server._Server__indexed_dataset[res.get('index')]
-print("Nb items: {}".format(len(server._Server__indexed_dataset)))
+server.delete(res.get('index'))
+print("Nb items: {}".format(len(server.indexed_dataset())))
 
 # 4- request again the initial index -> the first data retreives is not the same as the first request
 print(server.get_hyper_index(index, page_size))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Asyncio front-end for the pagination servers
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List
+
+HyperServer = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+class AsyncServer:
+    """Awaitable get_page/get_hyper/get_hyper_index.
+
+    Results come from the synchronous Server classes of tasks 2 and 3.
+    Everything that may parse the CSV or build an index runs in
+    `executor` (the loop's default one if None), and concurrent first
+    requests await the same load future instead of each starting one.
+    Once loaded, pages are sliced on the loop: they cost O(page_size).
+    """
+
+    def __init__(self, executor: Executor = None, memoize: Callable = None,
+                 **options):
+        """options are passed on to both synchronous servers, memoize
+        only to the one of task 2, whose dataset never changes
+        """
+        self._executor = executor
+        self._pages = HyperServer(memoize=memoize, **options)
+        self._indexed = DelServer(**options)
+        self._loads = {}
+
+    async def _ready(self, name: str, load: Callable[[], Any]) -> None:
+        """Run `load` once in the executor; concurrent callers share it
+        """
+        future = self._loads.get(name)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, load)
+            self._loads[name] = future
+        try:
+            await asyncio.shield(future)
+        except Exception:
+            if self._loads.get(name) is future:
+                del self._loads[name]
+            raise
+
+    async def get_page(self, page: int = 1, page_size: int = 10,
+                       filter: Dict = None,
+                       order_by: str = None) -> List[List]:
+        """Returns a page of data from the dataset
+        """
+        await self._ready('dataset', self._pages.dataset)
+        if filter or order_by:
+            await self._ready('query_index', self._pages.query_index)
+        return self._pages.get_page(page, page_size, filter, order_by)
+
+    async def get_hyper(self, page: int = 1,
+                        page_size: int = 10) -> Dict[str, Any]:
+        """Returns a page with its hypermedia metadata
+        """
+        await self._ready('dataset', self._pages.dataset)
+        return self._pages.get_hyper(page, page_size)
+
+    async def get_hyper_index(self, index: int = None,
+                              page_size: int = 10) -> Dict:
+        """Deletion-resilient hypermedia pagination
+        """
+        await self._ready('indexed_dataset', self._indexed.indexed_dataset)
+        return self._indexed.get_hyper_index(index, page_size)
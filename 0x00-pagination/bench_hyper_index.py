@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+get_hyper_index benchmark with 90% of the rows deleted
+"""
+import random
+import sys
+import time
+
+Server = __import__('3-hypermedia_del_pagination').Server
+IndexedDataset = __import__('indexed_dataset').IndexedDataset
+
+
+def legacy_hyper_index(indexed_data, bound, index, page_size):
+    """The original dict walk, probing one index at a time
+    """
+    current_index = index
+    data = []
+    while len(data) < page_size and current_index < bound:
+        item = indexed_data.get(current_index)
+        if item:
+            data.append(item)
+        current_index += 1
+    return data, current_index if current_index < bound else None
+
+
+def walk(get_page, page_size):
+    """Follow next_index from 0 to the end; return (pages, rows, seconds)
+    """
+    pages = rows = 0
+    index = 0
+    start = time.perf_counter()
+    while index is not None:
+        data, index = get_page(index, page_size)
+        pages += 1
+        rows += len(data)
+    return pages, rows, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    deleted_ratio = float(sys.argv[1]) if len(sys.argv) > 1 else 0.9
+    page_size = 10
+    server = Server()
+    rows = server.dataset()[:]
+    size = len(rows)
+    doomed = random.Random(0).sample(range(size), int(size * deleted_ratio))
+
+    # both structures hold the same list-of-lists rows, so only the
+    # lookup of live indexes differs; the Server line adds the cost of
+    # rebuilding rows from the columnar backend
+    legacy = dict(enumerate(rows))
+    indexed = IndexedDataset(rows)
+    for i in doomed:
+        del legacy[i]
+        indexed.delete(i)
+        server.delete(i)
+
+    def legacy_page(index, page_size):
+        """Legacy page as (data, next_index)"""
+        return legacy_hyper_index(legacy, size, index, page_size)
+
+    def indexed_page(index, page_size):
+        """IndexedDataset page as (data, next_index)"""
+        indexes = indexed.page(index, page_size)
+        next_index = indexes[-1] + 1 if len(indexes) == page_size else None
+        if next_index is not None and next_index >= size:
+            next_index = None
+        return indexed.rows(indexes), next_index
+
+    def server_page(index, page_size):
+        """Server.get_hyper_index page as (data, next_index)"""
+        res = server.get_hyper_index(index, page_size)
+        return res['data'], res['next_index']
+
+    print("rows: {:,}, deleted: {:.0%}, page_size: {}".format(
+        size, deleted_ratio, page_size))
+    for name, get_page in (("dict walk", legacy_page),
+                           ("bisect", indexed_page),
+                           ("Server", server_page)):
+        pages, rows, elapsed = walk(get_page, page_size)
+        print("{:<10} {:>6} pages {:>6} rows {:>9.4f} s {:>8.1f} us/page"
+              .format(name, pages, rows, elapsed, elapsed / pages * 1e6))
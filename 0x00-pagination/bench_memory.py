@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: list-of-lists dataset vs ColumnarDataset
+"""
+import csv
+import os
+import sys
+import time
+import tracemalloc
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+load_dataset = __import__('snapshot').load_dataset
+
+
+def list_of_lists(path):
+    """The original Server.dataset() loading strategy
+    """
+    with open(path) as f:
+        reader = csv.reader(f)
+        dataset = [row for row in reader]
+    return dataset[1:]
+
+
+def measure(loader, path):
+    """Return (retained bytes, peak bytes, seconds, rows) for `loader`;
+    the load is timed on a separate run since tracing slows it down
+    """
+    start = time.perf_counter()
+    loader(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    dataset = loader(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, elapsed, len(dataset)
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    size = os.path.getsize(path)
+    print("file: {} ({:,} bytes)".format(path, size))
+    print("{:<16}{:>14}{:>14}{:>10}{:>10}".format(
+        "backend", "retained", "peak", "x file", "load s"))
+    load_dataset(path)
+    # the snapshot's arrays live in a shared file mapping, which is not
+    # counted here: only the per-process bookkeeping is
+    for name, loader in (("list-of-lists", list_of_lists),
+                         ("columnar", ColumnarDataset.from_csv),
+                         ("snapshot", load_dataset)):
+        current, peak, elapsed, rows = measure(loader, path)
+        print("{:<16}{:>14,}{:>14,}{:>10.2f}{:>10.3f}".format(
+            name, current, peak, current / size, elapsed))
+    print("rows: {:,}".format(rows))
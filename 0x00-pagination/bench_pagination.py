@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Pagination benchmark suite
+
+Runs every scenario in its own Python process (so that cold loads are
+really cold and peak RSS is per scenario) and reports p50/p95/p99
+latency, throughput and peak RSS, as a table and optionally as JSON:
+
+    ./bench_pagination.py --output results.json
+    ./bench_pagination.py --compare results.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+SimpleServer = __import__('1-simple_pagination').Server
+HyperServer = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+index_range = __import__('0-simple_helper_function').index_range
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir, '0x01-caching'))
+cached = __import__('memoize').cached
+
+
+def timed_calls(call, arguments):
+    """Latency in seconds of `call(*args)` for every args in `arguments`
+    """
+    clock = time.perf_counter
+    latencies = []
+    for args in arguments:
+        start = clock()
+        call(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def cold_load(make_server, iterations):
+    """Time-to-first-page of brand new servers
+    """
+    latencies = []
+    for _ in range(iterations):
+        server = make_server()
+        latencies += timed_calls(server.get_page, [(1, 10)])
+    return latencies
+
+
+def pages(server, page_size, iterations, shuffle):
+    """(page, page_size) arguments walking the dataset
+    """
+    last = -(-len(server.dataset()) // page_size)
+    numbers = [i % last + 1 for i in range(iterations)]
+    if shuffle:
+        random.Random(0).shuffle(numbers)
+    return [(page, page_size) for page in numbers]
+
+
+def get_page(page_size, shuffle):
+    """Warm get_page scenario factory
+    """
+    def scenario(iterations):
+        """Warm get_page calls"""
+        server = SimpleServer()
+        return timed_calls(server.get_page,
+                           pages(server, page_size, iterations, shuffle))
+    return scenario
+
+
+def get_hyper(page_size, shuffle, memoize=None):
+    """Warm get_hyper scenario factory
+    """
+    def scenario(iterations):
+        """Warm get_hyper calls"""
+        server = HyperServer(memoize=memoize)
+        return timed_calls(server.get_hyper,
+                           pages(server, page_size, iterations, shuffle))
+    return scenario
+
+
+def deep_page(iterations):
+    """get_page and get_hyper on page 3000
+    """
+    server = HyperServer()
+    return (timed_calls(server.get_page, [(3000, 5)] * iterations)
+            + timed_calls(server.get_hyper, [(3000, 5)] * iterations))
+
+
+def get_hyper_index(deleted_ratio):
+    """get_hyper_index walk scenario factory
+    """
+    def scenario(iterations):
+        """Follow next_index through the indexed dataset"""
+        server = DelServer()
+        size = len(server.indexed_dataset())
+        for i in random.Random(0).sample(range(size),
+                                         int(size * deleted_ratio)):
+            server.delete(i)
+        latencies, index = [], 0
+        clock = time.perf_counter
+        for _ in range(iterations):
+            start = clock()
+            index = server.get_hyper_index(index, 10)['next_index']
+            latencies.append(clock() - start)
+            if index is None:
+                index = 0
+        return latencies
+    return scenario
+
+
+SCENARIOS = {
+    "index_range": (100000, lambda n: timed_calls(
+        index_range, [(i % 5000 + 1, 10) for i in range(n)])),
+    "cold_load_parse": (10, lambda n: cold_load(
+        lambda: SimpleServer(snapshot=False), n)),
+    "cold_load_snapshot": (50, lambda n: cold_load(SimpleServer, n)),
+    "cold_load_row_index": (200, lambda n: cold_load(
+        lambda: SimpleServer(row_index=True), n)),
+    "get_page_seq_10": (20000, get_page(10, False)),
+    "get_page_seq_100": (5000, get_page(100, False)),
+    "get_page_seq_1000": (500, get_page(1000, False)),
+    "get_page_random_10": (20000, get_page(10, True)),
+    "get_page_random_100": (5000, get_page(100, True)),
+    "get_hyper_seq_10": (20000, get_hyper(10, False)),
+    "get_hyper_random_100": (5000, get_hyper(100, True)),
+    "get_hyper_random_100_memoized": (5000, get_hyper(
+        100, True, cached(capacity=1024))),
+    "deep_page_3000": (10000, deep_page),
+    "get_hyper_index_walk": (20000, get_hyper_index(0.0)),
+    "get_hyper_index_90pct_deleted": (20000, get_hyper_index(0.9)),
+}
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list
+    """
+    rank = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def run_scenario(name, iterations=None):
+    """Run one scenario in this process and summarise it
+    """
+    default, scenario = SCENARIOS[name]
+    iterations = iterations or default
+    start = time.perf_counter()
+    latencies = scenario(iterations)
+    wall = time.perf_counter() - start
+    ordered = sorted(latencies)
+    busy = sum(latencies)
+    return {
+        "scenario": name,
+        "calls": len(latencies),
+        "p50_us": percentile(ordered, 0.50) * 1e6,
+        "p95_us": percentile(ordered, 0.95) * 1e6,
+        "p99_us": percentile(ordered, 0.99) * 1e6,
+        "max_us": ordered[-1] * 1e6,
+        "ops_per_s": len(latencies) / busy if busy else None,
+        "wall_s": wall,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_isolated(name, iterations=None):
+    """Run one scenario in a fresh interpreter
+    """
+    command = [sys.executable, __file__, "--scenario", name]
+    if iterations:
+        command += ["--iterations", str(iterations)]
+    output = subprocess.run(command, check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    return json.loads(output)
+
+
+def regressions(results, baseline, threshold):
+    """Scenarios whose p95 latency grew by more than `threshold`
+    """
+    previous = {r["scenario"]: r for r in baseline["results"]}
+    slower = []
+    for result in results:
+        old = previous.get(result["scenario"])
+        if old and result["p95_us"] > old["p95_us"] * (1 + threshold):
+            slower.append((result["scenario"], old["p95_us"],
+                           result["p95_us"]))
+    return slower
+
+
+def main():
+    """Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--only", nargs='+', choices=sorted(SCENARIOS),
+                        help="scenarios to run (default: all)")
+    parser.add_argument("--iterations", type=int,
+                        help="calls per scenario (default: per scenario)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="JSON results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative p95 growth (default: 0.25)")
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.iterations)))
+        return 0
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": [],
+    }
+    print("{:<32}{:>9}{:>11}{:>11}{:>11}{:>12}{:>11}".format(
+        "scenario", "calls", "p50 us", "p95 us", "p99 us", "ops/s",
+        "RSS KB"))
+    for name in args.only or SCENARIOS:
+        result = run_isolated(name, args.iterations)
+        report["results"].append(result)
+        print("{scenario:<32}{calls:>9}{p50_us:>11.1f}{p95_us:>11.1f}"
+              "{p99_us:>11.1f}{ops_per_s:>12.0f}{peak_rss_kb:>11}"
+              .format(**result))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            slower = regressions(report["results"], json.load(f),
+                                 args.threshold)
+        for name, old, new in slower:
+            print("REGRESSION {}: p95 {:.1f} us -> {:.1f} us".format(
+                name, old, new))
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Filtered/sorted page benchmark: naive scan vs secondary indexes
+"""
+import time
+
+Server = __import__('1-simple_pagination').Server
+
+QUERIES = [
+    ({"Gender": "FEMALE", "Year of Birth": 2016,
+      "Ethnicity": "HISPANIC"}, "Rank"),
+    ({"Gender": "MALE"}, "-Count"),
+    ({"Year of Birth": 2012}, None),
+    (None, "Rank"),
+]
+
+
+def naive_page(rows, header, page, page_size, filter, order_by):
+    """Scan every row, then sort and slice
+    """
+    matches = [row for row in rows
+               if all(row[header.index(name)] == str(value)
+                      for name, value in (filter or {}).items())]
+    if order_by:
+        column = header.index(order_by.lstrip('-'))
+        matches.sort(key=lambda row: int(row[column]),
+                     reverse=order_by.startswith('-'))
+    start = (page - 1) * page_size
+    return matches[start:start + page_size]
+
+
+def timed(function, repeat):
+    """Mean seconds per call of `function` over `repeat` calls
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == '__main__':
+    server = Server()
+    dataset = server.dataset()
+    rows, header = dataset[:], dataset.header
+    start = time.perf_counter()
+    server.query_index()
+    print("index build: {:.3f} s over {:,} rows".format(
+        time.perf_counter() - start, len(rows)))
+    print("{:<60}{:>12}{:>12}".format("query", "scan us", "index us"))
+    for filter, order_by in QUERIES:
+        scan = timed(lambda: naive_page(rows, header, 2, 10,
+                                        filter, order_by), 20)
+        indexed = timed(lambda: server.get_page(2, 10, filter, order_by),
+                        2000)
+        assert naive_page(rows, header, 2, 10, filter, order_by) == \
+            server.get_page(2, 10, filter, order_by)
+        label = "{} by {}".format(filter, order_by)
+        print("{:<60.60}{:>12.1f}{:>12.1f}".format(
+            label, scan * 1e6, indexed * 1e6))
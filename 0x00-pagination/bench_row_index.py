@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-page benchmark: full parse vs row-offset index
+"""
+import os
+import sys
+import tempfile
+import time
+
+Server = __import__('1-simple_pagination').Server
+
+
+def make_csv(source, path, copies):
+    """Write `copies` concatenations of `source`'s rows under one header
+    """
+    with open(source) as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith('\n'):
+        body += '\n'
+    with open(path, 'w') as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+
+
+def first_page(path, row_index):
+    """Seconds a brand new Server takes to return page 1
+    """
+    server = Server(row_index=row_index, snapshot=False)
+    server.DATA_FILE = path
+    start = time.perf_counter()
+    server.get_page(1, 10)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    source = "Popular_Baby_Names.csv"
+    sizes = [int(n) for n in sys.argv[1:]] or [1, 10, 100]
+    print("{:>12}{:>14}{:>14}{:>14}".format(
+        "rows", "full parse s", "index build s", "indexed s"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in sizes:
+            path = os.path.join(tmp, "names_{}.csv".format(copies))
+            make_csv(source, path, copies)
+            full = first_page(path, row_index=False)
+            build = first_page(path, row_index=True)
+            indexed = first_page(path, row_index=True)
+            server = Server(row_index=True)
+            server.DATA_FILE = path
+            rows = len(server.dataset())
+            print("{:>12,}{:>14.4f}{:>14.4f}{:>14.6f}".format(
+                rows, full, build, indexed))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Check that AsyncServer answers exactly like the synchronous servers
+"""
+import asyncio
+
+AsyncServer = __import__('async_server').AsyncServer
+HyperServer = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+async def main():
+    """Compare a concurrent burst of async requests with sync answers
+    """
+    server = AsyncServer()
+    pages = HyperServer()
+    indexed = DelServer()
+
+    requests = [(server.get_page(p, s), lambda p=p, s=s: pages.get_page(p, s))
+                for p, s in ((1, 3), (3, 2), (3000, 100))]
+    requests += [(server.get_hyper(p, s),
+                  lambda p=p, s=s: pages.get_hyper(p, s))
+                 for p, s in ((1, 2), (100, 3), (3000, 100))]
+    requests += [(server.get_hyper_index(i, s),
+                  lambda i=i, s=s: indexed.get_hyper_index(i, s))
+                 for i, s in ((3, 2), (5, 2), (19410, 10))]
+    requests += [(server.get_page(1, 5, {"Gender": "MALE"}, "-Count"),
+                  lambda: pages.get_page(1, 5, {"Gender": "MALE"}, "-Count"))]
+    results = await asyncio.gather(*(coroutine for coroutine, _ in requests))
+    for result, (_, expected) in zip(results, requests):
+        assert result == expected(), result
+    print("{} concurrent async requests match the sync servers".format(
+        len(requests)))
+
+    for bad in ((-10, 2), (0, 0), (2, 'Bob')):
+        try:
+            await server.get_page(*bad)
+        except AssertionError:
+            print("AssertionError raised for get_page{}".format(bad))
+    try:
+        await server.get_hyper_index(300000, 100)
+    except AssertionError:
+        print("AssertionError raised when out of range")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check that ColumnarDataset.from_csv reads what csv.reader reads, blank
+lines skipped and short rows padded, and rejects rows that are too long
+"""
+import csv
+import os
+import tempfile
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+
+LINES = [
+    'Year,Gender,Name,Count',
+    '2016,FEMALE,Olivia,172',
+    '',
+    '2016,MALE,"Smith, Jr",7',
+    '2015,FEMALE,Emma',
+    '2015,MALE',
+    '',
+    '',
+    '2014,"multi',
+    'line",Liam,010',
+    '2014,MALE,Noah,9',
+]
+
+
+def expected(path):
+    """Rows of `path` as csv.reader reads them, normalized the way the
+    loader documents: blank lines skipped, short rows padded
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        width = len(next(reader, []))
+        return [row + [''] * (width - len(row)) for row in reader if row]
+
+
+def written(lines):
+    """Path of a temporary CSV file made of `lines`
+    """
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(fd, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
+
+
+def check(lines, chunk_rows):
+    """Loader and csv.reader agree on `lines`
+    """
+    path = written(lines)
+    try:
+        ColumnarDataset.CHUNK_ROWS = chunk_rows
+        dataset = ColumnarDataset.from_csv(path)
+        rows = expected(path)
+        assert len(dataset) == len(rows), (len(dataset), len(rows))
+        assert dataset[:] == rows, dataset[:]
+        assert [dataset[i] for i in range(len(dataset))] == rows
+    finally:
+        os.unlink(path)
+
+
+def check_too_long():
+    """A row wider than the header names its line
+    """
+    path = written(LINES[:3] + ['2016,MALE,Liam,5,extra'] + LINES[3:])
+    try:
+        ColumnarDataset.from_csv(path)
+    except ValueError as e:
+        assert 'line 4' in str(e), e
+    else:
+        raise AssertionError("a row wider than the header was accepted")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    for chunk_rows in (1, 2, 3, 4096):
+        check(LINES, chunk_rows)
+    check(LINES[:1], 4096)
+    check([], 4096)
+    check_too_long()
+    print("from_csv matches csv.reader on blank and ragged lines")
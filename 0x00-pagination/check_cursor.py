@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Check cursor tokens: round trips, rejection of tampered and garbage
+tokens, and cursor pagination that stays exact while rows are deleted
+and inserted between pages
+"""
+import base64
+import os
+import random
+import struct
+import tempfile
+
+cursor = __import__('cursor')
+Server = __import__('3-hypermedia_del_pagination').Server
+
+ROWS = 1000
+
+
+def check_round_trip():
+    """decode_cursor inverts encode_cursor; tokens are URL-safe
+    """
+    for values in ((0, 0, 0), (1, 2, 3), (7, 19417, 19000),
+                   (2 ** 64 - 1, 2 ** 63, 2 ** 32 + 5)):
+        token = cursor.encode_cursor(*values)
+        assert cursor.decode_cursor(token) == values, values
+        assert token.isascii() and not set(token) & set('+/=')
+
+
+def check_rejected():
+    """Garbage, truncated, extended and wrong-version tokens decode to
+    None and make get_hyper_cursor raise AssertionError
+    """
+    token = cursor.encode_cursor(3, 40, 38)
+    raw = struct.pack('>BQQQ', cursor.VERSION + 1, 3, 40, 38)
+    bad = [None, 42, b'abc', '', '!!!!', 'not a cursor', token[:-1],
+           token[:-4], token + 'AAAA', token[:5] + '*' + token[6:],
+           base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')]
+    server = Server()
+    for token in bad:
+        assert cursor.decode_cursor(token) is None, token
+        if token is None:
+            continue
+        try:
+            server.get_hyper_cursor(token, 10)
+        except AssertionError:
+            pass
+        else:
+            raise AssertionError("accepted cursor {!r}".format(token))
+
+
+def walk(server, page_size, rng, mutate):
+    """Ids of the rows of every page of a cursor walk; between pages,
+    `mutate` deletes and inserts rows. Returns the ids read and the ids
+    deleted before the walk reached them
+    """
+    ids, token = [], None
+    while True:
+        page = server.get_hyper_cursor(token, page_size)
+        assert page["cursor"] == token
+        ids.extend(int(row[0]) for row in page["data"])
+        token = page["next_cursor"]
+        if token is None:
+            return ids
+        if mutate:
+            data = server.indexed_dataset()
+            position = data.locate(cursor.decode_cursor(token)[1])
+            live = list(data)
+            # the row the cursor points at, rows ahead and rows behind
+            for index in {live[position], rng.choice(live),
+                          rng.choice(live[position:])}:
+                server.delete(index)
+            server.insert([str(ROWS + len(ids)), "appended"])
+
+
+def check_deletions(path):
+    """Cursor walks read every row once, in order, skipping only the
+    rows deleted before the walk reached them
+    """
+    rng = random.Random(0)
+    for page_size in (1, 7, 50, ROWS + 1):
+        server = Server(snapshot=False)
+        server.DATA_FILE = path
+        assert walk(server, page_size, rng, False) == list(range(ROWS))
+        ids = walk(server, page_size, rng, True)
+        live = [int(row[0]) for row in
+                server.indexed_dataset().rows(list(server.indexed_dataset()))]
+        assert ids == sorted(set(ids)), page_size
+        deleted_late = set(ids) - set(live)
+        assert sorted(set(live) | deleted_late) == ids, page_size
+
+
+if __name__ == '__main__':
+    check_round_trip()
+    check_rejected()
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(fd, 'w') as f:
+        f.write("Id,Name\n")
+        f.writelines("{},name{}\n".format(i, i) for i in range(ROWS))
+    try:
+        check_deletions(path)
+    finally:
+        os.unlink(path)
+    print("cursor tokens round-trip, reject tampering and survive deletions")
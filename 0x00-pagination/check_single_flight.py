@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Concurrency check: a burst of first requests parses the CSV once
+"""
+import threading
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+IndexedDataset = __import__('indexed_dataset').IndexedDataset
+QueryIndex = __import__('query_index').QueryIndex
+
+
+def counting(cls, name):
+    """Wrap `cls.name` so that every call is counted
+    """
+    calls = []
+    attribute = cls.__dict__[name]
+    is_classmethod = isinstance(attribute, classmethod)
+    function = attribute.__func__ if is_classmethod else attribute
+
+    def wrapper(*args, **kwargs):
+        """Counted call"""
+        calls.append(threading.get_ident())
+        return function(*args, **kwargs)
+
+    setattr(cls, name, classmethod(wrapper) if is_classmethod else wrapper)
+    return calls
+
+
+def burst(request, threads=32):
+    """Release `threads` threads on `request` at the same instant
+    """
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        """One client"""
+        barrier.wait()
+        results.append(request())
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return results
+
+
+if __name__ == '__main__':
+    parses = counting(ColumnarDataset, 'from_csv')
+    indexes = counting(IndexedDataset, '__init__')
+    queries = counting(QueryIndex, '__init__')
+
+    for module in ('1-simple_pagination', '2-hypermedia_pagination'):
+        server = __import__(module).Server(snapshot=False)
+        del parses[:], queries[:]
+        pages = burst(lambda: server.get_page(2, 5))
+        assert len(parses) == 1 and all(p == pages[0] for p in pages)
+        burst(lambda: server.get_page(1, 5, order_by="Rank"))
+        assert len(parses) == 1 and len(queries) == 1
+        print("{}: 32 threads, CSV parsed {} time(s), index built {} time(s)"
+              .format(module, len(parses), len(queries)))
+
+    server = __import__('3-hypermedia_del_pagination').Server(snapshot=False)
+    del parses[:]
+    burst(lambda: server.get_hyper_index(0, 5))
+    assert len(parses) == 1 and len(indexes) == 1
+    print("3-hypermedia_del_pagination: 32 threads, CSV parsed {} time(s), "
+          "indexed {} time(s)".format(len(parses), len(indexes)))
+
+    del parses[:], indexes[:]
+    server = __import__('3-hypermedia_del_pagination').Server(
+        snapshot=False, warm_up=True)
+    burst(lambda: server.get_hyper_index(0, 5))
+    assert len(parses) == 1 and len(indexes) == 1
+    print("warm_up=True: CSV parsed {} time(s)".format(len(parses)))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Check that get_page_streaming and iter_pages return the rows of the
+fully loaded dataset, last partial page and empty files included
+"""
+import os
+import tempfile
+
+SERVERS = (__import__('1-simple_pagination').Server,
+           __import__('2-hypermedia_pagination').Server)
+
+
+def check(server_class, data_file):
+    """Streamed pages of `data_file` match pages of the loaded dataset
+    """
+    server = server_class(snapshot=False)
+    server.DATA_FILE = data_file
+    rows = server.dataset()[:]
+    for page_size in (1, 7, 100, len(rows) or 1, len(rows) + 1):
+        pages = list(server.iter_pages(page_size))
+        assert [row for page in pages for row in page] == rows, page_size
+        assert len(pages) == -(-len(rows) // page_size), page_size
+        assert all(len(page) == page_size for page in pages[:-1])
+        for page in sorted({1, 2, len(pages) // 2 or 1, len(pages),
+                            len(pages) + 1} - {0}):
+            streamed = server.get_page_streaming(page, page_size)
+            assert streamed == server.get_page(page, page_size), \
+                (page, page_size)
+            assert streamed == pages[page - 1] if page <= len(pages) \
+                else streamed == [], (page, page_size)
+    last = len(rows) // 100 + 1
+    if len(rows) % 100:
+        assert server.get_page_streaming(last, 100) == rows[-(len(rows) %
+                                                              100):]
+    return len(rows)
+
+
+def check_empty(server_class, text):
+    """A data file without rows streams no page
+    """
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    try:
+        assert check(server_class, path) == 0
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    for server_class in SERVERS:
+        count = check(server_class, server_class.DATA_FILE)
+        assert count % 100, "the last page of 100 rows must be partial"
+        check_empty(server_class, '')
+        check_empty(server_class, 'Year,Gender,Name,Count\n')
+    print("streamed pages match the loaded dataset over {} rows".format(
+        count))
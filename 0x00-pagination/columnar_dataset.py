@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Columnar dataset backend
+"""
+import csv
+from array import array
+from itertools import islice
+import collections.abc
+from typing import Iterator, List, Sequence
+
+
+def _smallest_array(values: array) -> array:
+    """Return `values` re-packed into the narrowest signed typecode
+    able to hold all of them
+    """
+    if not values:
+        return array('b')
+    low, high = min(values), max(values)
+    for typecode in ('b', 'h', 'i', 'q'):
+        limit = 1 << (array(typecode).itemsize * 8 - 1)
+        if -limit <= low and high < limit:
+            return array(typecode, values)
+    return values
+
+
+class _IntColumn:
+    """Column of canonical integers kept in a typed array
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values: array = None):
+        self.values = array('q') if values is None else values
+
+    def extend(self, cells: Sequence) -> bool:
+        """Append a chunk of cells; return False, leaving the column
+        untouched, if any of them is not a canonical integer
+        """
+        try:
+            values = array('q', map(int, cells))
+        except (ValueError, OverflowError):
+            return False
+        if list(map(str, values)) != list(cells):
+            return False
+        self.values.extend(values)
+        return True
+
+    def freeze(self) -> None:
+        """Shrink storage once loading is done
+        """
+        self.values = _smallest_array(self.values)
+
+    def __len__(self) -> int:
+        """Number of rows
+        """
+        return len(self.values)
+
+    def get(self, i: int) -> str:
+        """Cell `i` as a string
+        """
+        return str(self.values[i])
+
+    def get_slice(self, s: slice) -> List[str]:
+        """Cells in `s` as strings
+        """
+        return list(map(str, self.values[s]))
+
+
+class _CodedColumn:
+    """Dictionary-encoded column: every row stores a code into `table`
+    """
+    __slots__ = ('codes', 'table', 'lookup')
+
+    def __init__(self, codes: array = None, table: List[str] = None):
+        self.codes = array('q') if codes is None else codes
+        self.table = [] if table is None else table
+        self.lookup = {value: code for code, value in enumerate(self.table)}
+
+    def extend(self, cells: Sequence) -> None:
+        """Append a chunk of cells, growing the table on first sight
+        """
+        lookup = self.lookup
+        codes = [lookup.setdefault(value, len(lookup)) for value in cells]
+        if len(lookup) > len(self.table):
+            self.table.extend(list(lookup)[len(self.table):])
+        self.codes.extend(codes)
+
+    def freeze(self) -> None:
+        """Shrink storage once loading is done
+        """
+        self.codes = _smallest_array(self.codes)
+
+    def __len__(self) -> int:
+        """Number of rows
+        """
+        return len(self.codes)
+
+    def get(self, i: int) -> str:
+        """Cell `i` as a string
+        """
+        return self.table[self.codes[i]]
+
+    def get_slice(self, s: slice) -> List[str]:
+        """Cells in `s` as strings
+        """
+        table = self.table
+        return [table[code] for code in self.codes[s]]
+
+
+class ColumnarDataset(collections.abc.Sequence):
+    """Read-only, column-oriented copy of a CSV file.
+
+    Columns whose values are all canonical integers (Year of Birth,
+    Count, Rank) live in typed arrays; every other column (Gender,
+    Ethnicity, Child's First Name) is dictionary-encoded.
+    Rows are rebuilt as lists of strings only for the indexes that
+    are actually read, so a page costs O(page_size) allocations.
+    """
+    CHUNK_ROWS = 4096
+
+    def __init__(self, header: List[str], columns: List):
+        self.header = header
+        self._columns = columns
+        self._length = len(columns[0]) if columns else 0
+
+    @classmethod
+    def from_columns(cls, header: List[str],
+                     columns: List[tuple]) -> 'ColumnarDataset':
+        """Build a dataset from (values, table) pairs as returned by
+        column(); values may be any sequence of integers, such as a
+        memoryview over a memory-mapped file
+        """
+        return cls(header, [_IntColumn(values) if table is None
+                            else _CodedColumn(values, table)
+                            for values, table in columns])
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'ColumnarDataset':
+        """Parse `path` row by row, skipping its header line and blank
+        lines; short rows are padded with empty cells, and a row with
+        more cells than the header raises ValueError
+        """
+        with open(path) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            columns = [_IntColumn() for _ in header]
+            rows = cls._fitted(reader, len(header), path)
+            while True:
+                chunk = list(islice(rows, cls.CHUNK_ROWS))
+                if not chunk:
+                    break
+                for i, cells in enumerate(zip(*chunk)):
+                    column = columns[i]
+                    if (isinstance(column, _IntColumn)
+                            and column.extend(cells)):
+                        continue
+                    if isinstance(column, _IntColumn):
+                        column = columns[i] = cls._demote(column)
+                    column.extend(cells)
+        for column in columns:
+            column.freeze()
+        return cls(header, columns)
+
+    @staticmethod
+    def _fitted(reader, width: int, path: str) -> Iterator[List[str]]:
+        """Rows of `reader` with exactly `width` cells each
+        """
+        for row in reader:
+            if len(row) != width:
+                if not row:
+                    continue
+                if len(row) > width:
+                    raise ValueError("{}, line {}: {} fields, header has {}"
+                                     .format(path, reader.line_num,
+                                             len(row), width))
+                row += [''] * (width - len(row))
+            yield row
+
+    @staticmethod
+    def _demote(column: _IntColumn) -> _CodedColumn:
+        """Re-encode an integer column as a dictionary-encoded one
+        """
+        coded = _CodedColumn()
+        coded.extend(list(map(str, column.values)))
+        return coded
+
+    def __len__(self) -> int:
+        """Number of rows, header excluded
+        """
+        return self._length
+
+    def __getitem__(self, index):
+        """One row, or a list of rows for a slice
+        """
+        if isinstance(index, slice):
+            cells = [column.get_slice(index) for column in self._columns]
+            return [list(row) for row in zip(*cells)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("dataset index out of range")
+        return [column.get(index) for column in self._columns]
+
+    def column(self, name: str) -> tuple:
+        """Raw storage of column `name` as (values, table): integers
+        and None for an integer column, codes into `table` otherwise
+        """
+        column = self._columns[self.header.index(name)]
+        if isinstance(column, _IntColumn):
+            return column.values, None
+        return column.codes, column.table
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Opaque pagination cursors
+"""
+import base64
+import binascii
+import struct
+from typing import Tuple
+
+VERSION = 1
+_LAYOUT = struct.Struct('>BQQQ')
+
+
+def encode_cursor(generation: int, index: int, position: int) -> str:
+    """Pack a dataset generation, a row index and that row's position
+    among the live rows into an opaque, URL-safe token
+    """
+    raw = _LAYOUT.pack(VERSION, generation, index, position)
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int, int]:
+    """Return the (generation, index, position) packed in `cursor`,
+    or None if it is not a cursor of the current version
+    """
+    if not isinstance(cursor, str):
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        version, generation, index, position = _LAYOUT.unpack(raw)
+    except (binascii.Error, ValueError, struct.error):
+        return None
+    if version != VERSION:
+        return None
+    return generation, index, position
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Deletion-resilient indexed dataset
+"""
+import collections.abc
+from array import array
+from bisect import bisect_left
+from typing import List, Sequence
+
+
+class IndexedDataset(collections.abc.MutableMapping):
+    """Rows keyed by their original sorting position, starting at 0.
+
+    The live indexes are kept in a sorted typed array, so finding the
+    first live index at or after any position is a bisect (O(log n))
+    no matter how many rows were deleted in between. Rows of the
+    underlying dataset are only materialised when they are read.
+    `bound` is one past the highest index ever used and `generation`
+    is bumped by every insertion or deletion.
+    """
+
+    def __init__(self, rows: Sequence[List]):
+        self._base = rows
+        self._inserted = {}
+        self._keys = array('q', range(len(rows)))
+        self.bound = len(rows)
+        self.generation = 0
+
+    def _position(self, index: int) -> int:
+        """Position of `index` in the live keys, or -1 if it is not live
+        """
+        position = bisect_left(self._keys, index)
+        if position < len(self._keys) and self._keys[position] == index:
+            return position
+        return -1
+
+    def __len__(self) -> int:
+        """Number of live rows
+        """
+        return len(self._keys)
+
+    def __iter__(self):
+        """Live indexes in increasing order
+        """
+        return iter(self._keys)
+
+    def __contains__(self, index) -> bool:
+        """Whether `index` holds a live row
+        """
+        return isinstance(index, int) and self._position(index) >= 0
+
+    def __getitem__(self, index: int) -> List:
+        """Row stored at `index`
+        """
+        if index not in self:
+            raise KeyError(index)
+        return self.rows([index])[0]
+
+    def __setitem__(self, index: int, row: List) -> None:
+        """Store `row` at `index`, reviving it if it was deleted
+        """
+        if not isinstance(index, int) or index < 0:
+            raise KeyError(index)
+        if index not in self:
+            self._keys.insert(bisect_left(self._keys, index), index)
+        self._inserted[index] = row
+        self.bound = max(self.bound, index + 1)
+        self.generation += 1
+
+    def __delitem__(self, index: int) -> None:
+        """Delete the row stored at `index`
+        """
+        position = self._position(index) if isinstance(index, int) else -1
+        if position < 0:
+            raise KeyError(index)
+        del self._keys[position]
+        self._inserted.pop(index, None)
+        self.generation += 1
+
+    def delete(self, index: int) -> None:
+        """Delete the row stored at `index`
+        """
+        del self[index]
+
+    def insert(self, row: List, index: int = None) -> int:
+        """Store `row` at a free `index`, or after every index ever
+        used if none is given, and return that index
+        """
+        if index is None:
+            index = self.bound
+        elif index in self:
+            raise KeyError("index {} is already in use".format(index))
+        self[index] = row
+        return index
+
+    def locate(self, index: int) -> int:
+        """Position, among the live indexes, of the first live index
+        greater than or equal to `index`
+        """
+        return bisect_left(self._keys, index)
+
+    def index_at(self, position: int) -> int:
+        """Live index at `position`, or None past the last one
+        """
+        if 0 <= position < len(self._keys):
+            return self._keys[position]
+        return None
+
+    def window(self, position: int, size: int) -> List[int]:
+        """Up to `size` live indexes, starting at `position`
+        """
+        return self._keys[position:position + size].tolist()
+
+    def page(self, index: int, page_size: int) -> List[int]:
+        """Up to `page_size` live indexes, starting at the first live
+        index greater than or equal to `index`
+        """
+        return self.window(self.locate(index), page_size)
+
+    def rows(self, indexes: List[int]) -> List[List]:
+        """Rows stored at `indexes`, which must all be live
+        """
+        inserted, base = self._inserted, self._base
+        if not inserted:
+            if indexes and indexes[-1] - indexes[0] == len(indexes) - 1:
+                return base[indexes[0]:indexes[-1] + 1]
+            return [base[i] for i in indexes]
+        return [inserted[i] if i in inserted else base[i] for i in indexes]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Secondary indexes for filtered and sorted pagination
+"""
+from array import array
+from typing import Dict, List, Sequence
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+
+
+class QueryIndex:
+    """Posting lists and sort permutations over a ColumnarDataset.
+
+    For every combination of filtered columns and sort order the index
+    keeps one posting list per distinct value combination, already in
+    that order, so a filtered page is a dict lookup plus a slice:
+    O(page_size) instead of a scan of the whole dataset.
+    Posting lists for EAGER_COLUMNS in every EAGER_ORDERS are built
+    with the index; other combinations are built on first use.
+    """
+    EAGER_COLUMNS = ("Year of Birth", "Gender", "Ethnicity")
+    EAGER_ORDERS = (None, "Count", "Rank")
+
+    def __init__(self, dataset: ColumnarDataset):
+        self.dataset = dataset
+        self._keys = {}
+        self._lookups = {}
+        self._permutations = {}
+        self._postings = {}
+        for order in self.EAGER_ORDERS:
+            for name in self.EAGER_COLUMNS:
+                if name in dataset.header:
+                    self._posting_lists((name,), order)
+
+    def _column(self, name: str) -> Sequence[int]:
+        """Per-row integer keys of column `name`, whose order matches
+        the order of the column's values
+        """
+        if name not in self._keys:
+            if name not in self.dataset.header:
+                raise ValueError("Unknown column: {}".format(name))
+            values, table = self.dataset.column(name)
+            if table is None:
+                self._lookups[name] = None
+            else:
+                ranks = sorted(range(len(table)), key=table.__getitem__)
+                code_rank = [0] * len(table)
+                for rank, code in enumerate(ranks):
+                    code_rank[code] = rank
+                values = array('i', [code_rank[code] for code in values])
+                self._lookups[name] = {
+                    value: code_rank[code] for code, value in enumerate(table)
+                }
+            self._keys[name] = values
+        return self._keys[name]
+
+    def _key(self, name: str, value) -> int:
+        """Integer key of `value` in column `name`, None if absent
+        """
+        self._column(name)
+        lookup = self._lookups[name]
+        if lookup is None:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        return lookup.get(str(value))
+
+    def _permutation(self, order: str) -> Sequence[int]:
+        """Row ids stably sorted by column `order` ('-' prefix for
+        descending order), or in file order
+        """
+        if order is None:
+            return range(len(self.dataset))
+        if order not in self._permutations:
+            descending = order.startswith('-')
+            keys = self._column(order[1:] if descending else order)
+            self._permutations[order] = array('i', sorted(
+                range(len(self.dataset)), key=keys.__getitem__,
+                reverse=descending))
+        return self._permutations[order]
+
+    def _posting_lists(self, names: tuple, order: str) -> Dict:
+        """Row ids grouped by their values in `names`, each group in
+        `order`
+        """
+        if (names, order) not in self._postings:
+            columns = [self._column(name) for name in names]
+            postings = {}
+            for i in self._permutation(order):
+                key = tuple(column[i] for column in columns)
+                posting = postings.get(key)
+                if posting is None:
+                    posting = postings[key] = array('i')
+                posting.append(i)
+            self._postings[(names, order)] = postings
+        return self._postings[(names, order)]
+
+    def select(self, filter: Dict = None, order_by: str = None) -> Sequence:
+        """Row ids matching every `filter` column == value pair, stably
+        sorted by `order_by` ('-' prefix for descending order)
+        """
+        order_by = order_by or None
+        if order_by is not None:
+            self._column(order_by[1:] if order_by[0] == '-' else order_by)
+        if not filter:
+            return self._permutation(order_by)
+        header = self.dataset.header
+        for name in filter:
+            self._column(name)
+        names = tuple(sorted(filter, key=header.index))
+        key = tuple(self._key(name, filter[name]) for name in names)
+        if None in key:
+            return ()
+        return self._posting_lists(names, order_by).get(key, ())
+
+    def row_ids(self, start: int, end: int, filter: Dict = None,
+                order_by: str = None) -> List[int]:
+        """Row ids start (included) to end (excluded) of a query
+        """
+        return list(self.select(filter, order_by)[start:end])
+
+    def count(self, filter: Dict = None) -> int:
+        """Number of rows matching `filter`
+        """
+        return len(self.select(filter))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped CSV row-offset index
+"""
+import collections.abc
+import csv
+import io
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from typing import List
+
+
+class RowOffsetIndex:
+    """Byte offset of every data row of a CSV file, header excluded.
+
+    The offsets are written to a sidecar file next to the CSV together
+    with the CSV's mtime and size. Opening the sidecar maps it instead
+    of reading it, so an index over 20M rows opens as fast as one over
+    20k; it is rebuilt whenever the CSV's mtime or size has changed.
+    """
+    MAGIC = b'ROWIDX1\0'
+    HEADER = struct.Struct('=8sqqq')
+    SUFFIX = '.idx'
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+        self.path = csv_path + self.SUFFIX
+        if not self._open():
+            self.build()
+            if not self._open():
+                raise OSError("could not open row index {}".format(self.path))
+
+    def _open(self) -> bool:
+        """Map the sidecar file; return False if it is missing or stale
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(self._map) < self.HEADER.size:
+            self._map.close()
+            return False
+        magic, mtime_ns, size, count = self.HEADER.unpack_from(self._map)
+        payload = len(self._map) - self.HEADER.size
+        if (magic != self.MAGIC or payload != (count + 1) * 8
+                or self.is_stale(mtime_ns, size)):
+            self._map.close()
+            return False
+        self.count = count
+        self._offsets = memoryview(self._map)[self.HEADER.size:].cast('q')
+        return True
+
+    def is_stale(self, mtime_ns: int, size: int) -> bool:
+        """Whether the CSV changed since an index stamped with
+        `mtime_ns` and `size` was built
+        """
+        stat = os.stat(self.csv_path)
+        return stat.st_mtime_ns != mtime_ns or stat.st_size != size
+
+    def build(self) -> None:
+        """Scan the CSV once and atomically (re)write the sidecar file
+        through a temporary file of its own, so that concurrent
+        builders never share one; a failed replace is not an error
+        """
+        stat = os.stat(self.csv_path)
+        offsets = array('q')
+        with open(self.csv_path, 'rb') as f:
+            position = len(f.readline())
+            quoted = False
+            for line in f:
+                if not quoted:
+                    offsets.append(position)
+                # a newline inside a quoted field does not end the row
+                quoted ^= line.count(b'"') & 1
+                position += len(line)
+        offsets.append(position)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(self.path) + '.', suffix='.tmp',
+            dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, stat.st_mtime_ns,
+                                         stat.st_size, len(offsets) - 1))
+                offsets.tofile(f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # another process may hold or be replacing the sidecar; the
+            # caller reopens whichever complete index ends up in place
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def span(self, start: int, end: int) -> tuple:
+        """Byte range covering rows start (included) to end (excluded)
+        """
+        return self._offsets[start], self._offsets[end]
+
+    def close(self) -> None:
+        """Release the mapping
+        """
+        self._offsets.release()
+        self._map.close()
+
+
+class MappedCSVDataset(collections.abc.Sequence):
+    """Rows of a CSV file parsed on demand through a RowOffsetIndex.
+
+    Only the bytes between the first and last requested row are
+    decoded and fed to csv.reader; the rest of the file is never read.
+    """
+
+    def __init__(self, csv_path: str, encoding: str = 'utf-8'):
+        self.index = RowOffsetIndex(csv_path)
+        self.encoding = encoding
+        with open(csv_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                         if size else b'')
+
+    def __len__(self) -> int:
+        """Number of rows, header excluded
+        """
+        return self.index.count
+
+    def _parse(self, start: int, end: int) -> List[List[str]]:
+        """Parse rows start (included) to end (excluded)
+        """
+        if start >= end:
+            return []
+        low, high = self.index.span(start, end)
+        text = self._map[low:high].decode(self.encoding)
+        return list(csv.reader(io.StringIO(text, newline='')))
+
+    def __getitem__(self, index):
+        """One row, or a list of rows for a slice
+        """
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if step == 1:
+                return self._parse(start, end)
+            return [self[i] for i in range(start, end, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self._parse(index, index + 1)[0]
+
+    def close(self) -> None:
+        """Release the CSV and index mappings
+        """
+        if self._map:
+            self._map.close()
+        self.index.close()
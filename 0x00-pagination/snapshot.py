@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Binary snapshots of a parsed ColumnarDataset
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+ColumnarDataset = __import__('columnar_dataset').ColumnarDataset
+
+MAGIC = b'COLSNAP1'
+SUFFIX = '.snap'
+_HEADER = struct.Struct('=8s16sQ')
+_ALIGN = 8
+
+
+def checksum(path: str) -> bytes:
+    """BLAKE2b digest of the contents of `path`
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _aligned(size: int) -> int:
+    """`size` rounded up to the next multiple of _ALIGN
+    """
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def write_snapshot(dataset: ColumnarDataset, path: str,
+                   digest: bytes) -> None:
+    """Atomically write `dataset` to `path`, through a temporary file
+    of its own, stamped with the source file `digest`. Every column is
+    stored as a raw, aligned array so that read_snapshot can map it
+    without copying
+    """
+    blobs, columns, offset = [], [], 0
+    for name in dataset.header:
+        values, table = dataset.column(name)
+        typecode = getattr(values, 'typecode', None) or values.format
+        blob = bytes(values)
+        columns.append({"typecode": typecode, "offset": offset,
+                        "length": len(values), "table": table})
+        blobs.append(blob + b'\0' * (_aligned(len(blob)) - len(blob)))
+        offset += _aligned(len(blob))
+    meta = json.dumps({"header": dataset.header, "columns": columns})
+    meta = meta.encode('utf-8')
+    meta += b' ' * (_aligned(_HEADER.size + len(meta)) - _HEADER.size
+                    - len(meta))
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + '.', suffix='.tmp',
+        dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, digest, len(meta)))
+            f.write(meta)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_snapshot(path: str, digest: bytes) -> ColumnarDataset:
+    """Map the snapshot at `path`; return None if it is missing, damaged
+    or was not taken from a source file with this `digest`.
+    The columns stay backed by the shared, read-only mapping, so every
+    process reading the same snapshot shares the same physical pages
+    """
+    try:
+        with open(path, 'rb') as f:
+            snap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, stamp, meta_size = _HEADER.unpack_from(snap)
+        if magic != MAGIC or stamp != digest:
+            raise ValueError("stale snapshot")
+        start = _HEADER.size + meta_size
+        meta = json.loads(snap[_HEADER.size:start].decode('utf-8'))
+        view = memoryview(snap)
+        columns = []
+        for column in meta["columns"]:
+            low = start + column["offset"]
+            size = column["length"] * struct.calcsize(column["typecode"])
+            if low + size > len(snap):
+                raise ValueError("truncated snapshot")
+            values = view[low:low + size].cast(column["typecode"])
+            columns.append((values, column["table"]))
+    except (ValueError, KeyError, TypeError, struct.error):
+        snap.close()
+        return None
+    return ColumnarDataset.from_columns(meta["header"], columns)
+
+
+def load_dataset(csv_path: str) -> ColumnarDataset:
+    """ColumnarDataset of `csv_path`, read from its snapshot when that
+    snapshot matches the file's checksum, parsed (and snapshotted for
+    the next process) otherwise
+    """
+    path = csv_path + SUFFIX
+    digest = checksum(csv_path)
+    dataset = read_snapshot(path, digest)
+    if dataset is None:
+        dataset = ColumnarDataset.from_csv(csv_path)
+        try:
+            write_snapshot(dataset, path, digest)
+        except OSError:
+            pass
+    return dataset
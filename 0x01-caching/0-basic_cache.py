@@ -8,21 +8,35 @@ class BasicCache(BaseCaching):
     """class BasicCache
     This caching system doesn’t have limit
     """
-    def __init__(self):
+    def __init__(self, sizer=None, on_evict=BaseCaching.print_discard):
         """ Initiliaze
         """
-        super().__init__()
+        super().__init__(float('inf'), None, sizer, on_evict)
+
+    @BaseCaching.capacity.setter
+    def capacity(self, capacity):
+        """ A BasicCache never evicts, so it cannot be limited
+        """
+        raise ValueError("BasicCache has no capacity limit")
+
+    @BaseCaching.max_bytes.setter
+    def max_bytes(self, max_bytes):
+        """ A BasicCache never evicts, so it cannot be limited
+        """
+        raise ValueError("BasicCache has no byte budget")
 
     def put(self, key, item):
         """ Add an item in the cache
         """
         if key is None or item is None:
             return
-        self.cache_data[key] = item
+        self._store(key, item)
 
     def get(self, key):
         """ Get an item by key
         """
-        if key is None:
+        if key is None or key not in self.cache_data:
+            self.misses += 1
             return None
-        return self.cache_data.get(key, None)
+        self.hits += 1
+        return self.cache_data[key]
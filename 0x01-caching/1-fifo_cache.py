@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ FIFO caching module
 """
+from collections import OrderedDict
 BaseCaching = __import__('base_caching').BaseCaching
 
 
@@ -8,11 +9,12 @@ class FIFOCache(BaseCaching):
     """class FIFOCache
     """
 
-    def __init__(self):
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
         """Initialization
         """
-        super().__init__()
-        self.order = []
+        super().__init__(capacity, max_bytes, sizer, on_evict)
+        self.cache_data = OrderedDict()
 
     def put(self, key, item):
         """ Add an item in the cache
@@ -20,20 +22,32 @@ class FIFOCache(BaseCaching):
         if key is None or item is None:
             return
 
-        if key in self.cache_data.keys():
-            self.order.remove(key)
-
-        self.cache_data[key] = item
-        self.order.append(key)
-
-        if len(self.order) > BaseCaching.MAX_ITEMS:
-            d_key = self.order.pop(0)
-            print(f"DISCARD: {d_key}")
-            del self.cache_data[d_key]
+        size = None
+        if key in self.cache_data:
+            self.cache_data.move_to_end(key)
+        else:
+            size = self._make_room(key, item)
+            if size is None:
+                return
+        self._store(key, item, size)
+        self._shrink()
 
     def get(self, key):
         """ Get an item by key
         """
-        if key is None:
+        if key is None or key not in self.cache_data:
+            self.misses += 1
             return None
-        return self.cache_data.get(key, None)
+        self.hits += 1
+        return self.cache_data[key]
+
+    def _put_new_many(self, items):
+        """ Bulk put of new keys
+        """
+        self._append_many(items)
+
+    def _evict(self):
+        """ Remove the first item put in the cache
+        """
+        d_key, _ = self.cache_data.popitem(last=False)
+        return d_key
@@ -5,14 +5,21 @@ from base_caching import BaseCaching
 
 
 class LFUCache(BaseCaching):
-    """LFUCache class with LFU caching removal mechanism."""
+    """LFUCache class with LFU caching removal mechanism.
 
-    def __init__(self):
+    Keys are grouped in one bucket per access frequency. Each bucket is
+    an OrderedDict (a doubly linked list) in least recently used order
+    and min_freq points at the lowest non-empty bucket, so put, get and
+    eviction are all O(1).
+    """
+
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
         """Initialize LFUCache."""
-        super().__init__()
-        self.cache_data = OrderedDict()
-        self.freq = defaultdict(int)
-        self.lfu_keys = OrderedDict()
+        super().__init__(capacity, max_bytes, sizer, on_evict)
+        self.freq = {}
+        self.buckets = defaultdict(OrderedDict)
+        self.min_freq = 0
 
     def put(self, key, item):
         """Add an item to the cache with LFU eviction if necessary."""
@@ -20,34 +27,85 @@ class LFUCache(BaseCaching):
             return
 
         if key in self.cache_data:
-            self.cache_data[key] = item
+            self._store(key, item)
             self._update_frequency(key)
+            self._shrink()
         else:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                self._evict_lfu_item()
-            self.cache_data[key] = item
+            size = self._make_room(key, item)
+            if size is None:
+                return
+            self._store(key, item, size)
             self.freq[key] = 1
-            self.lfu_keys[key] = None
+            self.buckets[1][key] = None
+            self.min_freq = 1
 
     def get(self, key):
         """Retrieve an item by key."""
         if key is None or key not in self.cache_data:
+            self.misses += 1
             return None
+        self.hits += 1
         # Update frequency for accessed item
         self._update_frequency(key)
         return self.cache_data[key]
 
+    def _put_new_many(self, items):
+        """Bulk put of new keys: they all join the frequency-1 bucket,
+        so once the cache is full every new key evicts the front of
+        that bucket (the general victim only for the very first one)."""
+        excess = len(self.cache_data) + len(items) - self._capacity
+        if excess > 0 and len(self.cache_data) >= self._capacity:
+            self._discard(self._evict(), "capacity")
+            excess -= 1
+        ones = self.buckets.get(1, ())
+        while excess > 0 and ones:
+            key = next(iter(ones))
+            self._remove(key)
+            self._discard(key, "capacity")
+            excess -= 1
+        skipped = max(excess, 0)
+        self.puts += skipped
+        for key, _ in items[:skipped]:
+            self._discard(key, "capacity")
+        kept = items[skipped:]
+        self._store_new(kept)
+        ones = self.buckets[1]
+        for key, _ in kept:
+            self.freq[key] = 1
+            ones[key] = None
+        self.min_freq = 1
+
+    def _state(self):
+        """Frequencies, and recency within each frequency."""
+        return {"freq": self.freq, "buckets": self.buckets,
+                "min_freq": self.min_freq}
+
     def _update_frequency(self, key):
-        """Increment the frequency of a key."""
+        """Move a key to the bucket of the next frequency."""
         freq = self.freq[key]
-        del self.lfu_keys[key]
-        self.freq[key] += 1
-        self.lfu_keys[key] = None  # Move to the most recent position
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.freq[key] = freq + 1
+        self.buckets[freq + 1][key] = None  # Most recent position
 
-    def _evict_lfu_item(self):
+    def _evict(self):
         """Evict the least frequently used (LFU) item, using LRU if needed."""
-        lfu_key, _ = next(iter(self.lfu_keys.items()))
-        del self.cache_data[lfu_key]
-        del self.freq[lfu_key]
-        del self.lfu_keys[lfu_key]
-        print("DISCARD:", lfu_key)
+        if self.min_freq not in self.buckets:
+            # only after several evictions in a row (resize, byte budget)
+            self.min_freq = min(self.buckets)
+        lfu_key = next(iter(self.buckets[self.min_freq]))
+        self._remove(lfu_key)
+        return lfu_key
+
+    def _remove(self, key):
+        """Forget a key and its frequency."""
+        freq = self.freq.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+        del self.cache_data[key]
@@ -9,10 +9,11 @@ class LRUCache(BaseCaching):
     """class LRUCache
     """
 
-    def __init__(self):
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
         """Initialization
         """
-        super().__init__()
+        super().__init__(capacity, max_bytes, sizer, on_evict)
         self.cache_data = OrderedDict()
 
     def put(self, key, item):
@@ -21,18 +22,33 @@ class LRUCache(BaseCaching):
         if key is None or item is None:
             return
 
+        size = None
         if key in self.cache_data:
             self.cache_data.move_to_end(key)
-        self.cache_data[key] = item
-
-        if len(self.cache_data) > BaseCaching.MAX_ITEMS:
-            lru_key, _ = self.cache_data.popitem(last=False)
-            print(f"DISCARD: {lru_key}")
+        else:
+            size = self._make_room(key, item)
+            if size is None:
+                return
+        self._store(key, item, size)
+        self._shrink()
 
     def get(self, key):
         """ Get an item by key
         """
         if key is None or key not in self.cache_data:
+            self.misses += 1
             return None
+        self.hits += 1
         self.cache_data.move_to_end(key)
         return self.cache_data[key]
+
+    def _put_new_many(self, items):
+        """ Bulk put of new keys
+        """
+        self._append_many(items)
+
+    def _evict(self):
+        """ Remove the least recently used item
+        """
+        lru_key, _ = self.cache_data.popitem(last=False)
+        return lru_key
@@ -9,9 +9,10 @@ class MRUCache(BaseCaching):
     and implements MRU caching
     """
 
-    def __init__(self):
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
         """ Initialization """
-        super().__init__()
+        super().__init__(capacity, max_bytes, sizer, on_evict)
         self.cache_data = OrderedDict()
 
     def put(self, key, item):
@@ -20,16 +21,29 @@ class MRUCache(BaseCaching):
             return
 
         if key not in self.cache_data:
-            if len(self.cache_data) + 1 > BaseCaching.MAX_ITEMS:
-                mru_key, _ = self.cache_data.popitem(False)
-                print("DISCARD:", mru_key)
-            self.cache_data[key] = item
+            size = self._make_room(key, item)
+            if size is None:
+                return
+            self._store(key, item, size)
             self.cache_data.move_to_end(key, last=False)
         else:
-            self.cache_data[key] = item
+            self._store(key, item)
+            self._shrink()
 
     def get(self, key):
         """ Get an item by key """
-        if key is not None and key in self.cache_data:
-            self.cache_data.move_to_end(key, last=False)
-        return self.cache_data.get(key, None)
+        if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.cache_data.move_to_end(key, last=False)
+        return self.cache_data[key]
+
+    def _put_new_many(self, items):
+        """ Bulk put of new keys """
+        self._stack_many(items, last=False)
+
+    def _evict(self):
+        """ Remove the most recently used item """
+        mru_key, _ = self.cache_data.popitem(last=False)
+        return mru_key
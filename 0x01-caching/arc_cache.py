@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+""" ARC caching module
+"""
+from collections import OrderedDict
+BaseCaching = __import__('base_caching').BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """ Adaptive Replacement Cache (Megiddo & Modha).
+
+    Resident keys are split between t1 (seen once recently) and t2
+    (seen at least twice), both in LRU order. b1 and b2 remember the
+    keys recently evicted from each of them, without their items. A
+    miss that hits b1 means t1 was too small and grows the target size
+    p of t1; a miss that hits b2 shrinks it. A one-pass scan only goes
+    through t1, so it cannot flush the frequently used keys of t2.
+    """
+
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
+        """ Initialization
+        """
+        super().__init__(capacity, max_bytes, sizer, on_evict)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+        self._from_b2 = False
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+
+        if key in self.cache_data:
+            self._hit(key)
+            self._store(key, item)
+            self._shrink()
+            return
+        target = self.t2
+        if key in self.b1:
+            self.p = min(self._capacity, self.p +
+                         max(len(self.b2) // len(self.b1), 1))
+            del self.b1[key]
+        elif key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            del self.b2[key]
+            self._from_b2 = True
+        else:
+            target = self.t1
+        size = self._make_room(key, item)
+        self._from_b2 = False
+        if size is None:
+            return
+        self._store(key, item, size)
+        target[key] = None
+        self._trim_ghosts()
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._hit(key)
+        return self.cache_data[key]
+
+    def _state(self):
+        """ Lists, ghosts and the adaptive target
+        """
+        return {"t1": self.t1, "t2": self.t2, "b1": self.b1, "b2": self.b2,
+                "p": self.p}
+
+    def _hit(self, key):
+        """ A resident key was used again: most recent end of t2
+        """
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+
+    def _trim_ghosts(self):
+        """ Keep t1 + b1 within capacity and everything within twice it
+        """
+        capacity = self._capacity
+        while self.b1 and len(self.t1) + len(self.b1) > capacity:
+            self.b1.popitem(last=False)
+        while self.b2 and (len(self.t1) + len(self.t2) + len(self.b1) +
+                           len(self.b2)) > 2 * capacity:
+            self.b2.popitem(last=False)
+
+    def _evict(self):
+        """ Evict from t1 while it is above its target size, else from t2
+        """
+        if self.t1 and (not self.t2 or len(self.t1) > self.p or
+                        (self._from_b2 and len(self.t1) == self.p)):
+            key, _ = self.t1.popitem(last=False)
+            self.b1[key] = None
+        else:
+            key, _ = self.t2.popitem(last=False)
+            self.b2[key] = None
+        del self.cache_data[key]
+        self._trim_ghosts()
+        return key
+
+    def _remove(self, key):
+        """ Forget a key without keeping a ghost of it
+        """
+        self.t1.pop(key, None)
+        self.t2.pop(key, None)
+        del self.cache_data[key]
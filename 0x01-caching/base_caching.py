@@ -1,18 +1,140 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import os
+import pickle
+import sys
+import tempfile
+import time
+from collections import Counter
+from itertools import islice
+
+SAMPLE = 16
+
+
+def estimate_size(obj, depth=3):
+    """ Cheap estimate of the bytes held by `obj`: containers are
+    followed `depth` levels down and only their first SAMPLE items are
+    measured, the rest being assumed to be of the same average size
+    """
+    size = sys.getsizeof(obj)
+    if depth <= 0 or isinstance(obj, (str, bytes, bytearray, int, float)):
+        return size
+    if isinstance(obj, dict):
+        items = [estimate_size(k, depth - 1) + estimate_size(v, depth - 1)
+                 for k, v in islice(obj.items(), SAMPLE)]
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = [estimate_size(v, depth - 1) for v in islice(obj, SAMPLE)]
+    else:
+        return size
+    if items:
+        size += sum(items) * len(obj) // len(items)
+    return size
+
+
+def default_sizer(key, item):
+    """ Bytes charged to an entry unless a cache is given its own sizer
+    """
+    return estimate_size(key) + estimate_size(item)
+
+
+def print_discard(key, reason):
+    """ Default eviction hook
+    """
+    print(f"DISCARD: {key}")
+
+
+def _timed(method, histogram):
+    """ Wrap `method` to count its latencies in `histogram`, keyed by
+    the bit length of the nanoseconds taken
+    """
+    clock = time.perf_counter_ns
+
+    def timed(*args):
+        """ Timed call """
+        start = clock()
+        try:
+            return method(*args)
+        finally:
+            histogram[(clock() - start).bit_length()] += 1
+    return timed
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the limits of each instance: `capacity` items (MAX_ITEMS by
+        default) and, optionally, `max_bytes` bytes. Lowering either
+        one at runtime evicts entries until the cache fits again
+      - how entries are sized: `sizer(key, item)` returns the bytes
+        charged to an entry. Entries are only sized when a sizer is
+        given or a byte budget is set (with default_sizer unless
+        given); otherwise used_bytes stays 0 and puts skip the cost
+      - what happens on eviction: `on_evict(key, reason)` is called
+        with reason "capacity", "bytes" or "expired" (print_discard,
+        which prints DISCARD, unless given; None to do nothing)
     """
     MAX_ITEMS = 4
+    DUMP_VERSION = 1
+    DUMP_CHUNK = 1024
 
-    def __init__(self):
+    print_discard = staticmethod(print_discard)
+
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=print_discard):
         """ Initiliaze
         """
         self.cache_data = {}
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = Counter()
+        self.latency = None
+        self.used_bytes = 0
+        self._sizes = {}
+        self._sizer = sizer
+        self._capacity = self.MAX_ITEMS
+        self._max_bytes = None
+        # the base setters validate the limits; the cache is still empty
+        # so they evict nothing, and subclasses may forbid setting them
+        if capacity is not None:
+            BaseCaching.capacity.fset(self, capacity)
+        BaseCaching.max_bytes.fset(self, max_bytes)
+
+    @property
+    def capacity(self):
+        """ Maximum number of items
+        """
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        """ Set the maximum number of items, evicting if needed
+        """
+        if capacity is None or capacity < 0:
+            raise ValueError("capacity must be a non-negative integer")
+        self._capacity = capacity
+        self._shrink()
+
+    @property
+    def max_bytes(self):
+        """ Maximum total size of the entries, None for no limit
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        """ Set the byte budget, evicting if needed
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be None or non-negative")
+        if max_bytes is not None and self._sizer is None:
+            self._sizer = default_sizer
+            self._size_all()
+        self._max_bytes = max_bytes
+        self._shrink()
 
     def print_cache(self):
         """ Print the cache
@@ -30,3 +152,318 @@ class BaseCaching():
         """ Get an item by key
         """
         raise NotImplementedError("get must be implemented in your cache class")
+
+    def _evict(self):
+        """ Remove the entry chosen by the policy and return its key
+        """
+        raise NotImplementedError("_evict must be implemented in your "
+                                  "cache class")
+
+    def get_many(self, keys):
+        """ get() every key in order; return {key: item} for the hits
+        """
+        get = self.get
+        found = {}
+        for key in keys:
+            item = get(key)
+            if item is not None:
+                found[key] = item
+        return found
+
+    def put_many(self, items):
+        """ put() every (key, item) of a mapping or of an iterable of
+        pairs, in order. The policy's bulk path, if any, takes batches
+        of distinct new keys when only the item count is limited; it
+        evicts the same entries in the same order as sequential puts
+        """
+        items = list(items.items() if hasattr(items, 'items') else items)
+        bulk = self._put_new_many
+        if bulk is not None and items and self._max_bytes is None and \
+                self._capacity >= 1:
+            keys = {key for key, item in items if item is not None}
+            if (len(keys) == len(items) and None not in keys and
+                    keys.isdisjoint(self.cache_data)):
+                bulk(items)
+                return
+        put = self.put
+        for key, item in items:
+            put(key, item)
+
+    _put_new_many = None
+
+    def _append_many(self, items):
+        """ Bulk put of new keys for policies that add at one end and
+        evict from the other (FIFO, LRU): new keys that sequential puts
+        would evict before the batch ends are never stored or sized
+        """
+        existing = len(self.cache_data)
+        excess = existing + len(items) - self._capacity
+        for _ in range(min(excess, existing)):
+            self._discard(self._evict(), "capacity")
+        skipped = max(excess - existing, 0)
+        self.puts += skipped
+        for key, _ in items[:skipped]:
+            self._discard(key, "capacity")
+        self._store_new(items[skipped:])
+
+    def _store_new(self, items):
+        """ _store() for keys known to be new, in one pass
+        """
+        data, sizes, sizer = self.cache_data, self._sizes, self._sizer
+        self.puts += len(items)
+        if sizer is None:
+            for key, item in items:
+                data[key] = item
+            return
+        total = 0
+        for key, item in items:
+            data[key] = item
+            size = sizes[key] = sizer(key, item)
+            total += size
+        self.used_bytes += total
+
+    def _stack_many(self, items, last):
+        """ Bulk put of new keys for policies that evict from the end
+        they add to (LIFO at the back, MRU at the front): once full,
+        every new key evicts the one put just before it
+        """
+        data = self.cache_data
+        free = max(self._capacity - len(data), 0)
+        kept = items
+        if len(items) > free:
+            if free:
+                doomed = items[free - 1:-1]
+            else:
+                self._discard(self._evict(), "capacity")
+                doomed = items[:-1]
+            self.puts += len(doomed)
+            for key, _ in doomed:
+                self._discard(key, "capacity")
+            kept = items[:max(free - 1, 0)] + items[-1:]
+        self._store_new(kept)
+        if not last:
+            for key, _ in kept:
+                data.move_to_end(key, last=False)
+
+    def delete(self, key, reason=None):
+        """ Remove an entry; return whether it was there. The removal is
+        reported as an eviction only if a `reason` is given
+        """
+        if key is None or key not in self.cache_data:
+            return False
+        self._remove(key)
+        if reason is None:
+            self.used_bytes -= self._sizes.pop(key, 0)
+        else:
+            self._discard(key, reason)
+        return True
+
+    def _remove(self, key):
+        """ Forget `key` in the data and in the policy's bookkeeping
+        """
+        del self.cache_data[key]
+
+    def dump(self, path):
+        """ Atomically save the entries, their sizes, the limits and the
+        policy's bookkeeping to `path`. Entries are pickled in chunks of
+        DUMP_CHUNK, so no copy of the whole cache is ever built; do not
+        modify the cache meanwhile
+        """
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(path) + '.', suffix='.tmp',
+            dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            self._dump(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _dump(self, fd):
+        """ Body of dump(), writing to an open file descriptor
+        """
+        with os.fdopen(fd, 'wb') as f:
+            pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+            pickler.dump({
+                "version": self.DUMP_VERSION,
+                "policy": type(self).__name__,
+                "capacity": self._capacity,
+                "max_bytes": self._max_bytes,
+                "sized": self._sizer is not None,
+                "state": self._state(),
+            })
+            sizes, entries = self._sizes, iter(self.cache_data.items())
+            while True:
+                chunk = list(islice(entries, self.DUMP_CHUNK))
+                if not chunk:
+                    break
+                keys, items = zip(*chunk)
+                pickler.dump((keys, items, [sizes.get(k, 0) for k in keys]))
+                pickler.clear_memo()
+            pickler.dump(None)
+
+    def load(self, path):
+        """ Replace the content of this cache with a dump of the same
+        policy; it then evicts exactly as the dumped instance would
+        have. The file is unpickled: only load dumps you wrote
+        """
+        with open(path, 'rb') as f:
+            unpickler = pickle.Unpickler(f)
+            header = unpickler.load()
+            if (not isinstance(header, dict) or
+                    header.get("version") != self.DUMP_VERSION):
+                raise ValueError("{} is not a cache dump".format(path))
+            if header["policy"] != type(self).__name__:
+                raise ValueError("{} holds a {}, not a {}".format(
+                    path, header["policy"], type(self).__name__))
+            data, sizes = self.cache_data, self._sizes
+            data.clear()
+            sizes.clear()
+            sized = header.get("sized", True)
+            used = 0
+            for keys, items, chunk_sizes in iter(unpickler.load, None):
+                data.update(zip(keys, items))
+                if sized:
+                    sizes.update(zip(keys, chunk_sizes))
+                    used += sum(chunk_sizes)
+        self.used_bytes = used
+        self._capacity = header["capacity"]
+        self._max_bytes = header["max_bytes"]
+        self._set_state(header["state"])
+        if self._sizer is None and (sized or self._max_bytes is not None):
+            self._sizer = default_sizer
+        if not sized and self._sizer is not None:
+            self._size_all()
+
+    def _state(self):
+        """ The policy's bookkeeping besides the order of cache_data
+        """
+        return {}
+
+    def _set_state(self, state):
+        """ Restore what _state returned
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def memory_usage(self):
+        """ Accounting of this instance: entries and bytes against their
+        limits, plus the size of the bookkeeping dictionaries
+        """
+        return {
+            "items": len(self.cache_data),
+            "capacity": self._capacity,
+            "bytes": self.used_bytes,
+            "max_bytes": self._max_bytes,
+            "overhead_bytes": (sys.getsizeof(self.cache_data) +
+                               sys.getsizeof(self._sizes)),
+        }
+
+    def stats(self):
+        """ Counters since creation (or reset_stats), current size and,
+        if recorded, get/put latency histograms as {upper bound in
+        nanoseconds: calls}
+        """
+        gets = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / gets if gets else None,
+            "puts": self.puts,
+            "evictions": dict(self.evictions),
+            "items": len(self.cache_data),
+            "bytes": self.used_bytes,
+        }
+        if self.latency is not None:
+            for name, histogram in self.latency.items():
+                stats[name + "_latency_ns"] = {
+                    1 << bits: histogram[bits] for bits in sorted(histogram)}
+        return stats
+
+    def reset_stats(self):
+        """ Zero the counters and histograms
+        """
+        self.hits = self.misses = self.puts = 0
+        self.evictions.clear()
+        if self.latency is not None:
+            for histogram in self.latency.values():
+                histogram.clear()
+
+    def record_latency(self, enabled=True):
+        """ Start (or stop) timing every get and put of this instance
+        """
+        self.__dict__.pop('get', None)
+        self.__dict__.pop('put', None)
+        self.latency = None
+        if enabled:
+            self.latency = {"get": Counter(), "put": Counter()}
+            self.get = _timed(self.get, self.latency["get"])
+            self.put = _timed(self.put, self.latency["put"])
+
+    def _reason(self, items=0):
+        """ Which limit an eviction is made for
+        """
+        if len(self.cache_data) + items > self._capacity:
+            return "capacity"
+        return "bytes"
+
+    def _fits(self, items=0, size=0):
+        """ Whether `items` more entries of `size` more bytes fit
+        """
+        if len(self.cache_data) + items > self._capacity:
+            return False
+        return (self._max_bytes is None or
+                self.used_bytes + size <= self._max_bytes)
+
+    def _size(self, key, item):
+        """ Bytes charged to an entry, 0 if entries are not sized
+        """
+        return 0 if self._sizer is None else self._sizer(key, item)
+
+    def _size_all(self):
+        """ Size every entry, when sizing starts on a filled cache
+        """
+        sizer = self._sizer
+        self._sizes.clear()
+        for key, item in self.cache_data.items():
+            self._sizes[key] = sizer(key, item)
+        self.used_bytes = sum(self._sizes.values())
+
+    def _make_room(self, key, item):
+        """ Evict entries until a new entry fits; return its size, to be
+        passed to _store, or None if it can never fit, in which case it
+        must not be stored
+        """
+        size = self._size(key, item)
+        while self.cache_data and not self._fits(1, size):
+            reason = self._reason(1)
+            self._discard(self._evict(), reason)
+        return size if self._fits(1, size) else None
+
+    def _shrink(self):
+        """ Evict entries until the cache is within its limits
+        """
+        while self.cache_data and not self._fits():
+            reason = self._reason()
+            self._discard(self._evict(), reason)
+
+    def _store(self, key, item, size=None):
+        """ Assign an item, keeping the byte count up to date; `size` is
+        the one _make_room returned, if it was called
+        """
+        self.cache_data[key] = item
+        self.puts += 1
+        if self._sizer is None:
+            return
+        if size is None:
+            size = self._sizer(key, item)
+        self.used_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _discard(self, key, reason):
+        """ Account for an entry evicted by the policy and report it
+        """
+        self.used_bytes -= self._sizes.pop(key, 0)
+        self.evictions[reason] += 1
+        if self.on_evict is not None:
+            self.on_evict(key, reason)
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+""" Warming caches with 100k entries: put() one by one vs put_many() """
+import sys
+import time
+default_sizer = __import__('base_caching').default_sizer
+policies = [policy for policy in __import__('fixtures').policies
+            if policy._put_new_many is not None]
+
+
+def warm(policy, capacity, items, batched, sizer=None):
+    """ Seconds to put `items` into an empty cache """
+    cache = policy(capacity=capacity, sizer=sizer, on_evict=None)
+    start = time.perf_counter()
+    if batched:
+        cache.put_many(items)
+    else:
+        for key, item in items:
+            cache.put(key, item)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    entries = int(sys.argv[1]) if sys.argv[1:] else 100000
+    items = [("page:{}".format(i), [i, "row", i * 2]) for i in range(entries)]
+    sizers = {"none": None, "default": default_sizer,
+              "constant": lambda key, item: 64}
+    print("{:<12}{:>10}{:>10}{:>12}{:>12}{:>10}".format(
+        "policy", "capacity", "sizer", "put ms", "put_many ms", "speedup"))
+    for policy in policies:
+        for capacity in (entries, entries // 10):
+            for name, sizer in sizers.items():
+                one = min(warm(policy, capacity, items, False, sizer)
+                          for _ in range(3))
+                many = min(warm(policy, capacity, items, True, sizer)
+                           for _ in range(3))
+                print("{:<12}{:>10}{:>10}{:>12.1f}{:>12.1f}{:>9.1f}x".format(
+                    policy.__name__, capacity, name, one * 1e3, many * 1e3,
+                    one / many))
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+""" Compact LRU/MRU against the OrderedDict ones: same behaviour, fewer
+bytes and objects per entry """
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+LRUCache = __import__('3-lru_cache').LRUCache
+MRUCache = __import__('4-mru_cache').MRUCache
+compact_cache = __import__('compact_cache')
+CompactLRUCache = compact_cache.CompactLRUCache
+CompactMRUCache = compact_cache.CompactMRUCache
+
+PAIRS = ((LRUCache, CompactLRUCache), (MRUCache, CompactMRUCache))
+
+
+def run(cache_class, seed):
+    """ Random mix of every operation; returns the eviction log, final
+    contents and counters """
+    rng = random.Random(seed)
+    log = []
+    cache = cache_class(capacity=50, max_bytes=4000,
+                        on_evict=lambda key, reason: log.append((key, reason)))
+    for _ in range(5000):
+        op = rng.random()
+        key = rng.randrange(120)
+        if op < 0.4:
+            cache.put(key, "v" * rng.randrange(1, 100))
+        elif op < 0.75:
+            cache.get(key)
+        elif op < 0.8:
+            cache.delete(key, rng.choice((None, "invalidated")))
+        elif op < 0.9:
+            cache.put_many([(rng.randrange(120), key)
+                            for _ in range(rng.randrange(80))])
+        elif op < 0.95:
+            cache.get_many([rng.randrange(120) for _ in range(10)])
+        elif op < 0.97:
+            cache.max_bytes = rng.choice((1500, 4000, None))
+        else:
+            fd, path = tempfile.mkstemp()
+            os.close(fd)
+            try:
+                cache.dump(path)
+                cache = cache_class(on_evict=cache.on_evict)
+                cache.load(path)
+            finally:
+                os.unlink(path)
+    return (log, list(cache.cache_data.items()), cache.used_bytes,
+            dict(cache._sizes), cache.hits, cache.misses)
+
+
+def check_same():
+    """ Each compact cache behaves exactly like its OrderedDict twin """
+    for classic, compact in PAIRS:
+        for seed in range(20):
+            assert run(classic, seed) == run(compact, seed), \
+                (compact.__name__, seed)
+
+
+def sized(key, item):
+    """ A constant sizer, so that the caches keep entry sizes """
+    return 64
+
+
+def footprint(cache_class, entries, sizer):
+    """ Bytes and gc-tracked objects per entry of a full cache, besides
+    the keys and values themselves """
+    keys = list(range(entries))
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    cache = cache_class(capacity=entries, sizer=sizer, on_evict=None)
+    for key in keys:
+        cache.put(key, key)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    gc.collect()
+    objects = len(gc.get_objects()) - objects
+    return size / entries, objects / entries, cache
+
+
+def speed(cache_class, entries, trace, sizer):
+    """ get-or-put operations per second on a trace """
+    cache = cache_class(capacity=entries, sizer=sizer, on_evict=None)
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+    return len(trace) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    check_same()
+    entries = int(sys.argv[1]) if sys.argv[1:] else 200000
+    rng = random.Random(0)
+    trace = [int(rng.paretovariate(0.6)) for _ in range(500000)]
+    print("{:<18}{:>7}{:>10}{:>14}{:>12}{:>14}".format(
+        "policy", "sizes", "B/entry", "objects/entry", "ops/s",
+        "overhead B"))
+    for sizer in (None, sized):
+        for cache_class in (class_ for pair in PAIRS for class_ in pair):
+            size, objects, cache = footprint(cache_class, entries, sizer)
+            print("{:<18}{:>7}{:>10.1f}{:>14.2f}{:>12.0f}{:>14}".format(
+                cache_class.__name__, "no" if sizer is None else "yes",
+                size, objects,
+                speed(cache_class, entries // 10, trace, sizer),
+                cache.memory_usage()["overhead_bytes"]))
+            del cache
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+""" Throughput of the thread-safe caches as threads are added """
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+concurrent_cache = __import__('concurrent_cache')
+LRUCache = __import__('3-lru_cache').LRUCache
+LockedCache = concurrent_cache.LockedCache
+ShardedCache = concurrent_cache.ShardedCache
+
+VARIANTS = {
+    "locked": lambda: LockedCache(LRUCache(capacity=10000)),
+    "sharded": lambda: ShardedCache(LRUCache, 16, capacity=10000),
+    "sharded+read_mostly": lambda: ShardedCache(
+        LRUCache, 16, capacity=10000, read_mostly=True),
+}
+
+
+def worker(cache, keys, start):
+    """ 90% gets, misses filled with a put """
+    start.wait()
+    for key in keys:
+        if cache.get(key) is None:
+            cache.put(key, key)
+
+
+def throughput(make_cache, threads, operations=400000):
+    """ Operations per second of `threads` threads sharing one cache """
+    cache = make_cache()
+    rng = random.Random(0)
+    for key in range(10000):
+        cache.put(key, key)
+    share = operations // threads
+    start = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(
+        cache, [rng.randrange(11000) for _ in range(share)], start))
+        for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return share * threads / (time.perf_counter() - began)
+
+
+if __name__ == "__main__":
+    counts = [int(n) for n in sys.argv[1:]] or [1, 2, 4, 8]
+    print("{:<22}".format("ops/s") +
+          "".join("{:>12}".format("{} thr".format(n)) for n in counts))
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        rows = [(name, [throughput(make, n) for n in counts])
+                for name, make in VARIANTS.items()]
+    for name, results in rows:
+        print("{:<22}".format(name) +
+              "".join("{:>12,.0f}".format(r) for r in results))
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+""" Put latency of FIFOCache/LIFOCache as capacity grows """
+import contextlib
+import os
+import sys
+import time
+BaseCaching = __import__('base_caching').BaseCaching
+FIFOCache = __import__('1-fifo_cache').FIFOCache
+LIFOCache = __import__('2-lifo_cache').LIFOCache
+
+
+class ListFIFOCache(BaseCaching):
+    """ The previous FIFOCache, ordered by a plain list """
+
+    def __init__(self):
+        """ Initialization """
+        super().__init__()
+        self.order = []
+
+    def put(self, key, item):
+        """ Add an item in the cache """
+        if key in self.cache_data.keys():
+            self.order.remove(key)
+        self.cache_data[key] = item
+        self.order.append(key)
+        if len(self.order) > BaseCaching.MAX_ITEMS:
+            d_key = self.order.pop(0)
+            print(f"DISCARD: {d_key}")
+            del self.cache_data[d_key]
+
+
+class ListLIFOCache(ListFIFOCache):
+    """ The previous LIFOCache, ordered by a plain list """
+
+    def put(self, key, item):
+        """ Add an item in the cache """
+        if key in self.cache_data.keys():
+            self.order.remove(key)
+        if len(self.order) >= BaseCaching.MAX_ITEMS:
+            d_key = self.order.pop(-1)
+            print(f"DISCARD: {d_key}")
+            del self.cache_data[d_key]
+        self.cache_data[key] = item
+        self.order.append(key)
+
+
+def put_latency(cache_class, capacity, puts):
+    """ Mean microseconds per put once the cache is full: half new keys
+    (each one evicts), half updates of the oldest resident key """
+    BaseCaching.MAX_ITEMS = capacity
+    cache = cache_class()
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for key in range(capacity):
+            cache.put(key, key)
+        start = time.perf_counter()
+        for key in range(capacity, capacity + puts):
+            cache.put(key, key)
+            cache.put(next(iter(cache.cache_data)), key)
+        elapsed = time.perf_counter() - start
+    return elapsed / (2 * puts) * 1e6
+
+
+if __name__ == "__main__":
+    capacities = [int(n) for n in sys.argv[1:]] or \
+        [4, 100, 10000, 100000, 1000000]
+    classes = (FIFOCache, ListFIFOCache, LIFOCache, ListLIFOCache)
+    print("{:>10}".format("capacity") +
+          "".join("{:>16}".format(c.__name__) for c in classes))
+    for capacity in capacities:
+        row = "{:>10,}".format(capacity)
+        for cache_class in classes:
+            if cache_class.__name__.startswith("List") and capacity > 100000:
+                row += "{:>16}".format("(skipped)")
+                continue
+            puts = 200 if cache_class.__name__.startswith("List") else 20000
+            row += "{:>13.2f} us".format(
+                put_latency(cache_class, capacity, puts))
+        print(row)
+    BaseCaching.MAX_ITEMS = 4
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+""" LFUCache: scan resistance check and Zipf hit-rate benchmark """
+import contextlib
+import os
+import sys
+import time
+from collections import OrderedDict
+BaseCaching = __import__('base_caching').BaseCaching
+LFUCache = __import__('100-lfu_cache').LFUCache
+workloads = __import__('workloads')
+
+
+class RecencyLFUCache(BaseCaching):
+    """ The previous LFUCache, which counted frequencies but evicted
+    the first key of a recency-ordered OrderedDict """
+
+    def __init__(self):
+        """ Initialization """
+        super().__init__()
+        self.freq = {}
+        self.lfu_keys = OrderedDict()
+
+    def put(self, key, item):
+        """ Add an item in the cache """
+        if key in self.cache_data:
+            self.cache_data[key] = item
+            self.get(key)
+            return
+        if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
+            lfu_key, _ = self.lfu_keys.popitem(last=False)
+            del self.cache_data[lfu_key]
+            del self.freq[lfu_key]
+            print("DISCARD:", lfu_key)
+        self.cache_data[key] = item
+        self.freq[key] = 1
+        self.lfu_keys[key] = None
+
+    def get(self, key):
+        """ Get an item by key """
+        if key not in self.cache_data:
+            return None
+        self.freq[key] += 1
+        self.lfu_keys.move_to_end(key)
+        return self.cache_data[key]
+
+
+def hit_rate(cache_class, capacity, trace):
+    """ Fraction of gets answered from a cache that is filled on miss,
+    and the mean microseconds per access """
+    BaseCaching.MAX_ITEMS = capacity
+    cache = cache_class()
+    hits = 0
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for key in trace:
+            if cache.get(key) is None:
+                cache.put(key, key)
+            else:
+                hits += 1
+        elapsed = time.perf_counter() - start
+    return hits / len(trace), elapsed / len(trace) * 1e6
+
+
+def check_hot_keys_survive_scan():
+    """ Hot keys read many times must outlive a one-pass scan """
+    BaseCaching.MAX_ITEMS = 10
+    hot = ["hot{}".format(i) for i in range(5)]
+    for cache_class in (LFUCache, RecencyLFUCache):
+        cache = cache_class()
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull):
+            for _ in range(3):
+                for key in hot:
+                    if cache.get(key) is None:
+                        cache.put(key, key)
+            for page in range(1000):
+                cache.put("page{}".format(page), page)
+        survivors = sum(cache.get(key) is not None for key in hot)
+        print("{:<16} hot keys left after a 1000-key scan: {}/{}".format(
+            cache_class.__name__, survivors, len(hot)))
+        if cache_class is LFUCache:
+            assert survivors == len(hot)
+
+
+if __name__ == "__main__":
+    check_hot_keys_survive_scan()
+    skews = [float(s) for s in sys.argv[1:]] or [0.8, 1.0, 1.2]
+    print("\n{:>6}{:>10}{:>18}{:>18}{:>12}".format(
+        "skew", "capacity", "LFUCache", "RecencyLFUCache", "us/access"))
+    for skew in skews:
+        trace = workloads.zipf(10000, 200000, skew)
+        for capacity in (10, 100, 1000):
+            lfu, lfu_us = hit_rate(LFUCache, capacity, trace)
+            old, _ = hit_rate(RecencyLFUCache, capacity, trace)
+            print("{:>6}{:>10}{:>17.1%}{:>18.1%}{:>12.2f}".format(
+                skew, capacity, lfu, old, lfu_us))
+    BaseCaching.MAX_ITEMS = 4
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+""" Hit rates of every policy on synthetic traces, including a hot set
+interrupted by a bulk export that reads every page once """
+import contextlib
+import os
+import sys
+workloads = __import__('workloads')
+
+POLICIES = [
+    __import__('1-fifo_cache').FIFOCache,
+    __import__('2-lifo_cache').LIFOCache,
+    __import__('3-lru_cache').LRUCache,
+    __import__('4-mru_cache').MRUCache,
+    __import__('100-lfu_cache').LFUCache,
+    __import__('arc_cache').ARCCache,
+    __import__('two_queue_cache').TwoQueueCache,
+    __import__('tinylfu_cache').WTinyLFUCache,
+]
+
+
+def hit_rate(policy, capacity, trace):
+    """ Fraction of gets answered by a cache filled on miss; export
+    pages are not counted, only what they cost the other keys """
+    cache = policy(capacity=capacity)
+    hits = gets = 0
+    for key in trace:
+        scan = isinstance(key, tuple)
+        gets += not scan
+        if cache.get(key) is None:
+            cache.put(key, True)
+        elif not scan:
+            hits += 1
+    return hits / gets
+
+
+if __name__ == "__main__":
+    capacity = int(sys.argv[1]) if sys.argv[1:] else 500
+    traces = {
+        "zipf": workloads.zipf(10000, 200000),
+        "zipf+export": workloads.scan(10000, 200000),
+        "loop": workloads.loop(capacity * 5 // 4, 200000),
+    }
+    print("capacity {}".format(capacity))
+    print("{:<16}".format("policy") +
+          "".join("{:>14}".format(name) for name in traces))
+    with open(os.devnull, 'w') as devnull:
+        for policy in POLICIES:
+            with contextlib.redirect_stdout(devnull):
+                rates = [hit_rate(policy, capacity, trace)
+                         for trace in traces.values()]
+            print("{:<16}".format(policy.__name__) +
+                  "".join("{:>14.1%}".format(rate) for rate in rates))
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+""" Byte-budget caches on a trace of mixed-size values """
+import contextlib
+import os
+import random
+import sys
+LRUCache = __import__('3-lru_cache').LRUCache
+LFUCache = __import__('100-lfu_cache').LFUCache
+GDSCache = __import__('gds_cache').GDSCache
+
+
+def mixed_trace(keys, length, skew, seed=0):
+    """ Zipf accesses where one key in ten is a 100x larger value """
+    rng = random.Random(seed)
+    sizes = {key: 20000 if key % 10 == 0 else 200 for key in range(keys)}
+    weights = [1 / rank ** skew for rank in range(1, keys + 1)]
+    return sizes, rng.choices(range(keys), weights, k=length)
+
+
+def hit_ratios(cache, sizes, trace):
+    """ Object and byte hit ratios of a cache filled on miss """
+    hits = hit_bytes = total_bytes = 0
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for key in trace:
+            total_bytes += sizes[key]
+            if cache.get(key) is None:
+                cache.put(key, sizes[key])
+            else:
+                hits += 1
+                hit_bytes += sizes[key]
+    return hits / len(trace), hit_bytes / total_bytes
+
+
+def check_budget():
+    """ Caches never hold more bytes than their budget """
+    for cache_class in (LRUCache, LFUCache, GDSCache):
+        cache = cache_class(capacity=1000, max_bytes=1000,
+                            sizer=lambda key, item: item)
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull):
+            for key, size in enumerate([300, 500, 400, 900, 2000, 100]):
+                cache.put(key, size)
+                assert cache.used_bytes <= 1000
+            cache.max_bytes = 150
+        assert cache.used_bytes == 100 and 5 in cache.cache_data
+        assert 4 not in cache.cache_data
+
+
+if __name__ == "__main__":
+    check_budget()
+    budget = int(sys.argv[1]) if sys.argv[1:] else 200000
+    sizes, trace = mixed_trace(5000, 200000, 0.9)
+    print("{:<12}{:>12}{:>12}{:>10}{:>14}".format(
+        "policy", "hit ratio", "byte hits", "items", "overhead B"))
+    for cache_class in (LRUCache, LFUCache, GDSCache):
+        cache = cache_class(capacity=10 ** 9, max_bytes=budget,
+                            sizer=lambda key, item: item)
+        hits, byte_hits = hit_ratios(cache, sizes, trace)
+        usage = cache.memory_usage()
+        print("{:<12}{:>11.1%}{:>12.1%}{:>10}{:>14}".format(
+            cache_class.__name__, hits, byte_hits, usage["items"],
+            usage["overhead_bytes"]))
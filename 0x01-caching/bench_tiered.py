@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+""" 16 worker processes serving Zipf-distributed pagination pages:
+private LRU caches vs small L1 caches over one shared FileStore """
+import multiprocessing
+import random
+import resource
+import shutil
+import sys
+import tempfile
+LRUCache = __import__('3-lru_cache').LRUCache
+default_sizer = __import__('base_caching').default_sizer
+FileStore = __import__('shared_store').FileStore
+TieredCache = __import__('tiered_cache').TieredCache
+
+PAGES = 5000
+REQUESTS = 5000
+CAPACITY = 400
+
+
+def build_page(key):
+    """ The origin: a page of 10 baby-name rows """
+    page = int(key.split(':')[1])
+    return [["2016", "FEMALE", "ASIAN AND PACIFIC ISLANDER",
+             "Name{}".format(page * 10 + i), str(i), str(page)]
+            for i in range(10)]
+
+
+def serve(args):
+    """ One worker: REQUESTS page requests through its cache """
+    mode, seed, directory = args
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, PAGES + 1)]
+    trace = rng.choices(range(PAGES), weights, k=REQUESTS)
+    loads = 0
+    if mode == "private":
+        cache = LRUCache(capacity=CAPACITY, sizer=default_sizer,
+                         on_evict=None)
+    else:
+        cache = TieredCache(LRUCache(capacity=CAPACITY // 4,
+                                     sizer=default_sizer, on_evict=None),
+                            FileStore(directory), loader=build_page,
+                            write_through=(mode == "write-through"))
+    for page in trace:
+        key = "page:{}".format(page)
+        if mode == "private":
+            if cache.get(key) is None:
+                cache.put(key, build_page(key))
+                loads += 1
+        else:
+            cache.get(key)
+    if mode != "private":
+        cache.flush()
+        loads = cache.loads
+        cache = cache.l1
+    return (loads, cache.memory_usage()["bytes"],
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def run(mode, workers):
+    """ Origin hit rate and cache memory of `workers` processes """
+    directory = tempfile.mkdtemp(dir=FileStore().directory)
+    try:
+        with multiprocessing.Pool(workers, maxtasksperchild=1) as pool:
+            results = pool.map(serve, [(mode, seed, directory)
+                                       for seed in range(workers)])
+        shared = FileStore(directory).memory_usage()["bytes"]
+    finally:
+        shutil.rmtree(directory)
+    loads = sum(r[0] for r in results)
+    private = sum(r[1] for r in results)
+    return (1 - loads / (REQUESTS * workers), loads, private, shared,
+            max(r[2] for r in results))
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if sys.argv[1:] else 16
+    print("{} processes, {} requests each over {} pages".format(
+        workers, REQUESTS, PAGES))
+    print("{:<16}{:>10}{:>14}{:>14}{:>12}{:>14}".format(
+        "mode", "hit rate", "origin loads", "private KB", "shared KB",
+        "max RSS KB"))
+    for mode in ("private", "write-through", "write-back"):
+        rate, loads, private, shared, rss = run(mode, workers)
+        print("{:<16}{:>9.1%}{:>14}{:>14.0f}{:>12.0f}{:>14}".format(
+            mode, rate, loads, private / 1024, shared / 1024, rss))
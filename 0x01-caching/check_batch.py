@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+""" get_many/put_many against the same calls made one by one: same
+evictions in the same order, same entries, same order and counters """
+import random
+concurrent_cache = __import__('concurrent_cache')
+TTLCache = __import__('ttl_cache').TTLCache
+LoadingCache = __import__('loading_cache').LoadingCache
+fixtures = __import__('fixtures')
+make = fixtures.make
+policies = [fixtures.BasicCache] + fixtures.policies
+
+
+def state(cache, log):
+    """ Everything sequential and batched calls must agree on """
+    stats = cache.stats()
+    return (list(cache.cache_data.items()), log, stats["hits"],
+            stats["misses"], stats["puts"], stats["evictions"],
+            cache.used_bytes)
+
+
+def check(policy, seed):
+    """ Random batches of gets and puts, some of new keys only """
+    rng = random.Random(seed)
+    capacity = rng.choice([1, 2, 5, 50])
+    max_bytes = rng.choice([None, None, 3000])
+    one_log, many_log = [], []
+    one = make(policy, one_log, capacity, max_bytes)
+    many = make(policy, many_log, capacity, max_bytes)
+    fresh = 1000
+    for _ in range(40):
+        size = rng.choice([1, 3, capacity, 2 * capacity + 1, 100])
+        if rng.random() < 0.3:
+            keys = [rng.randrange(120) for _ in range(size)]
+            found = {}
+            for key in keys:
+                item = one.get(key)
+                if item is not None:
+                    found[key] = item
+            assert many.get_many(keys) == found
+            continue
+        if rng.random() < 0.5:
+            keys = range(fresh, fresh + size)
+            fresh += size
+        else:
+            keys = [rng.randrange(120) for _ in range(size)]
+        batch = [(key, "v{}".format(rng.randrange(1000))) for key in keys]
+        if rng.random() < 0.5:
+            batch = list(dict(batch).items())
+            many.put_many(dict(batch))
+        else:
+            many.put_many(batch)
+        for key, item in batch:
+            one.put(key, item)
+        assert state(one, one_log) == state(many, many_log), policy
+        del one_log[:], many_log[:]
+
+
+def check_sharded(policy, seed):
+    """ ShardedCache batches match the same calls made one by one """
+    rng = random.Random(seed)
+    one, many = (concurrent_cache.ShardedCache(
+        policy, 4, capacity=40, on_evict=None) for _ in range(2))
+    for _ in range(40):
+        keys = [rng.randrange(120) for _ in range(rng.randrange(30))]
+        if rng.random() < 0.3:
+            found = {key: one.get(key) for key in keys}
+            assert many.get_many(keys) == {
+                key: item for key, item in found.items() if item is not None}
+        else:
+            batch = [(key, "v{}".format(rng.randrange(1000)))
+                     for key in keys]
+            many.put_many(batch)
+            for key, item in batch:
+                one.put(key, item)
+        for a, b in zip(one.shards, many.shards):
+            assert list(a.cache_data.items()) == list(b.cache_data.items())
+    assert one.stats() == many.stats()
+
+
+def check_wrapped(policy, seed):
+    """ TTLCache and LoadingCache batches match the same calls made one
+    by one, expiry included, as time goes by """
+    rng = random.Random(seed)
+    now = [0.0]
+    capacity = rng.choice([2, 5, 50])
+    max_bytes = rng.choice([None, 3000])
+    default_ttl, ttl = rng.choice([None, 5]), rng.choice([None, 5])
+    logs = [], [], [], []
+    ttl_one, ttl_many = (TTLCache(make(policy, log, capacity, max_bytes),
+                                  default_ttl, lambda: now[0])
+                         for log in logs[:2])
+    load_one, load_many = (LoadingCache(make(policy, log, capacity,
+                                             max_bytes),
+                                        ttl, clock=lambda: now[0])
+                           for log in logs[2:])
+    for _ in range(40):
+        now[0] += rng.choice([0, 0, 1, 3])
+        keys = [rng.randrange(60) for _ in range(rng.randrange(30))]
+        if rng.random() < 0.4:
+            for one, many in ((ttl_one, ttl_many), (load_one, load_many)):
+                found = {key: one.get(key) for key in keys}
+                assert many.get_many(keys) == {
+                    key: item for key, item in found.items()
+                    if item is not None}
+        else:
+            batch = [(key, "v{}".format(rng.randrange(1000)))
+                     for key in keys]
+            ttl = rng.choice([None, 2, 10])
+            ttl_many.put_many(batch, ttl)
+            load_many.put_many(batch)
+            for key, item in batch:
+                ttl_one.put(key, item, ttl)
+                load_one.put(key, item)
+        assert ttl_one.expiry == ttl_many.expiry
+        assert all(ttl_one.ttl(key) == ttl_many.ttl(key) for key in keys)
+        assert state(ttl_one.cache, logs[0]) == state(ttl_many.cache,
+                                                      logs[1]), policy
+        assert state(load_one.cache, logs[2]) == state(load_many.cache,
+                                                       logs[3]), policy
+        for log in logs:
+            del log[:]
+
+
+if __name__ == "__main__":
+    for policy in policies:
+        for seed in range(200):
+            check(policy, seed)
+    for policy in policies[1:]:
+        for seed in range(50):
+            check_sharded(policy, seed)
+    for policy in policies:
+        for seed in range(50):
+            check_wrapped(policy, seed)
+    print("put_many/get_many match sequential calls for {} policies"
+          .format(len(policies)))
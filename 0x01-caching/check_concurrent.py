@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+""" Multi-threaded stress test of LockedCache and ShardedCache: after
+many threads mix gets, puts and deletes, every shard must still be
+consistent """
+import contextlib
+import os
+import random
+import sys
+import threading
+concurrent_cache = __import__('concurrent_cache')
+LockedCache = concurrent_cache.LockedCache
+ShardedCache = concurrent_cache.ShardedCache
+policies = __import__('fixtures').policies
+
+
+def hammer(cache, seed, operations, errors):
+    """ Random operations on 500 keys; values are checked on read """
+    rng = random.Random(seed)
+    try:
+        for _ in range(operations):
+            key = rng.randrange(500)
+            action = rng.random()
+            if action < 0.7:
+                item = cache.get(key)
+                assert item is None or item == key * 2, (key, item)
+            elif action < 0.9:
+                cache.put(key, key * 2)
+            elif action < 0.93:
+                keys = [rng.randrange(500) for _ in range(8)]
+                for key, item in cache.get_many(keys).items():
+                    assert item == key * 2, (key, item)
+            elif action < 0.96:
+                cache.put_many([(key, key * 2)
+                                for key in rng.sample(range(500), 8)])
+            else:
+                cache.delete(key)
+    except Exception as e:
+        errors.append(e)
+
+
+def consistent(shard):
+    """ A shard's bookkeeping agrees with its data """
+    keys = set(shard.cache_data)
+    assert len(keys) <= shard.capacity
+    assert set(shard._sizes) == keys
+    assert shard.used_bytes == sum(shard._sizes.values())
+    if shard.max_bytes is not None:
+        assert shard.used_bytes <= shard.max_bytes
+    if hasattr(shard, 'freq'):
+        assert set(shard.freq) == keys
+        assert sum(len(b) for b in shard.buckets.values()) == len(keys)
+    if hasattr(shard, 'priority'):
+        assert set(shard.priority) == keys
+
+
+def stress(cache, shards, threads=8, operations=20000):
+    """ Run `threads` threads against `cache`, then check `shards` """
+    errors = []
+    workers = [threading.Thread(target=hammer,
+                                args=(cache, seed, operations, errors))
+               for seed in range(threads)]
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(switch)
+    if errors:
+        raise errors[0]
+    for shard in shards:
+        consistent(shard)
+
+
+def check_counts(policy, threads=8, gets=20000):
+    """ With read_mostly, every get is counted once, as a hit or a
+    miss, even if its entry is evicted before the hit is replayed """
+    cache = ShardedCache(policy, 4, capacity=40, read_mostly=True,
+                         on_evict=None)
+
+    served = [0] * threads
+
+    def reader(seed):
+        """ Gets, with a put on every miss """
+        rng = random.Random(seed)
+        for _ in range(gets):
+            key = rng.randrange(200)
+            if cache.get(key) is None:
+                cache.put(key, key)
+            else:
+                served[seed] += 1
+
+    workers = [threading.Thread(target=reader, args=(seed,))
+               for seed in range(threads)]
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(switch)
+    for i, lock in enumerate(cache.locks):
+        with lock:
+            cache._replay(i)
+    stats = cache.stats()
+    assert stats["hits"] == sum(served), (stats, sum(served))
+    assert stats["misses"] == threads * gets - sum(served), stats
+
+
+if __name__ == "__main__":
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for policy in policies:
+            locked = LockedCache(policy(capacity=100, max_bytes=8000))
+            stress(locked, [locked.cache])
+            for read_mostly in (False, True):
+                sharded = ShardedCache(policy, 8, capacity=100,
+                                       max_bytes=8000,
+                                       read_mostly=read_mostly)
+                stress(sharded, sharded.shards)
+                assert len(sharded) <= 100
+            check_counts(policy)
+    print("{} policies consistent under 8 threads".format(len(policies)))
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+""" dump()/load(): a restored cache evicts exactly like the original """
+import os
+import random
+import tempfile
+import time
+fixtures = __import__('fixtures')
+policies = [fixtures.BasicCache] + fixtures.policies
+
+
+def make(policy, log):
+    """ A cache recording its evictions in `log` """
+    return fixtures.make(policy, log, capacity=50, max_bytes=8000)
+
+
+def workload(cache, rng, steps):
+    """ Skewed gets, puts on miss """
+    for _ in range(steps):
+        key = int(rng.paretovariate(1.2)) % 300
+        if cache.get(key) is None:
+            cache.put(key, "v" * rng.randrange(1, 100))
+
+
+def check(policy, path):
+    """ Dump halfway through a workload, load into a fresh instance and
+    finish the workload on both """
+    log, restored_log = [], []
+    cache = make(policy, log)
+    workload(cache, random.Random(1), 3000)
+    cache.dump(path)
+    restored = make(policy, restored_log)
+    restored.load(path)
+    assert list(restored.cache_data.items()) == list(cache.cache_data.items())
+    assert restored.used_bytes == cache.used_bytes
+    del log[:]
+    workload(cache, random.Random(2), 3000)
+    workload(restored, random.Random(2), 3000)
+    assert restored_log == log, policy
+    assert list(restored.cache_data.items()) == list(cache.cache_data.items())
+    try:
+        policies[1 if policy is not policies[1] else 2]().load(path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("loaded a dump of another policy")
+
+
+def timing(path, entries=200000):
+    """ Dump and load times of a large LRU cache """
+    cache = policies[3](capacity=entries, on_evict=None)
+    cache.put_many(("page:{}".format(i), [i, "row", i * 2])
+                   for i in range(entries))
+    start = time.perf_counter()
+    cache.dump(path)
+    dumped = time.perf_counter()
+    policies[3](on_evict=None).load(path)
+    loaded = time.perf_counter()
+    print("{} entries: dump {:.0f} ms, load {:.0f} ms, {:.1f} MB".format(
+        entries, (dumped - start) * 1e3, (loaded - dumped) * 1e3,
+        os.path.getsize(path) / 1e6))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.dump")
+        for policy in policies:
+            check(policy, path)
+        print("restored caches evict like the originals for {} policies"
+              .format(len(policies)))
+        timing(path)
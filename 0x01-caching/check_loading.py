@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+""" LoadingCache: coalesced misses, stale-while-revalidate and XFetch,
+then a thundering herd on an expired pagination page """
+import math
+import os
+import random
+import sys
+import threading
+import time
+LoadingCache = __import__('loading_cache').LoadingCache
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class FakeClock():
+    """ A clock that only moves when told to """
+
+    def __init__(self):
+        """ Initialization """
+        self.now = 0.0
+
+    def __call__(self):
+        """ Current time """
+        return self.now
+
+
+def herd(call, threads=32):
+    """ Results of `call()` from `threads` threads started together """
+    start = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        """ Wait for the others, then call """
+        start.wait()
+        results.append(call())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+def settle(cache):
+    """ Wait for background refreshes to finish """
+    while cache._refreshing:
+        time.sleep(0.005)
+
+
+def check_coalescing():
+    """ A cold key is loaded once however many threads miss on it """
+    cache = LoadingCache(LRUCache(on_evict=None), ttl=10)
+    calls = []
+
+    def loader(key):
+        """ Slow loader """
+        calls.append(key)
+        time.sleep(0.1)
+        return key * 2
+
+    assert herd(lambda: cache.get_or_load(21, loader)) == [42] * 32
+    assert calls == [21] and cache.stats()["loads"] == 1
+
+
+def check_stale_while_revalidate():
+    """ Past expiry, the stale value is served at once while a single
+    background reload runs """
+    clock = FakeClock()
+    cache = LoadingCache(LRUCache(on_evict=None), ttl=10, stale_ttl=5,
+                         clock=clock, rng=random.Random(0))
+    version = [1]
+    release = threading.Event()
+
+    def loader(key):
+        """ Loader that waits to be released after the first load """
+        if version[0] > 1:
+            release.wait()
+        return "{}v{}".format(key, version[0])
+
+    assert cache.get_or_load("p", loader) == "pv1"
+    version[0] = 2
+    clock.now = 12
+    began = time.perf_counter()
+    assert herd(lambda: cache.get_or_load("p", loader)) == ["pv1"] * 32
+    assert time.perf_counter() - began < 0.5
+    stats = cache.stats()
+    assert stats["refreshes"] == 1 and stats["stale_hits"] == 32
+    release.set()
+    settle(cache)
+    assert cache.get_or_load("p", loader) == "pv2"
+    clock.now = 12 + 10 + 5
+    version[0] = 3
+    assert cache.get_or_load("p", loader) == "pv3", "too stale: load"
+
+
+def check_xfetch():
+    """ Early refresh probability is exp(-gap / (delta * beta)) """
+    cache = LoadingCache(LRUCache(on_evict=None), ttl=60, beta=1.0,
+                         rng=random.Random(0))
+    for gap, delta in ((0.5, 1.0), (1.0, 1.0), (3.0, 1.0), (3.0, 0.1)):
+        draws = 20000
+        early = sum(cache._early(100 - gap, 100, delta)
+                    for _ in range(draws))
+        expected = math.exp(-gap / delta)
+        assert abs(early / draws - expected) < 0.01, (gap, delta)
+
+
+def check_pagination_herd():
+    """ 64 requests for an expired page of the CSV-backed Server reach
+    it once, and none of them waits for it """
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 os.pardir, '0x00-pagination'))
+    os.chdir(sys.path[-1])
+    server = __import__('1-simple_pagination').Server()
+    clock = FakeClock()
+    cache = LoadingCache(LRUCache(capacity=100, on_evict=None), ttl=30,
+                         stale_ttl=30, clock=clock)
+    served = []
+
+    def get_page(key):
+        """ Server.get_page, counted """
+        served.append(key)
+        return server.get_page(*key)
+
+    expected = server.get_page(3, 10)
+    assert cache.get_or_load((3, 10), get_page) == expected
+    clock.now = 45
+    pages = herd(lambda: cache.get_or_load((3, 10), get_page), 64)
+    settle(cache)
+    assert pages == [expected] * 64 and len(served) == 2
+    print("64 concurrent requests for an expired page: {} Server call(s)"
+          .format(len(served) - 1))
+
+
+if __name__ == "__main__":
+    check_coalescing()
+    check_stale_while_revalidate()
+    check_xfetch()
+    print("coalescing, stale-while-revalidate and XFetch OK")
+    check_pagination_herd()
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+""" cached(): memoization, single-flight for threads and coroutines,
+TTL expiry and uncacheable calls """
+import asyncio
+import threading
+import time
+cached = __import__('memoize').cached
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+def check_memoization():
+    """ Results are reused, keyword order does not matter, None is
+    cached, unhashable arguments bypass the cache """
+    calls = []
+
+    @cached(capacity=2)
+    def add(a, b=0, **options):
+        """ Recorded addition """
+        calls.append((a, b))
+        return None if a < 0 else a + b
+
+    assert add(1, b=2) == add(1, b=2) == 3
+    assert add(1, c=1, b=2) == add(1, b=2, c=1) == 3
+    assert add(-1) is None and add(-1) is None
+    assert add(1, b=2, c=[1]) == add(1, b=2, c=[1]) == 3
+    assert calls == [(1, 2), (1, 2), (-1, 0), (1, 2), (1, 2)]
+    add(5), add(6), add(7)
+    assert add.cache_info()["items"] == 2
+    add.cache_clear()
+    assert add.cache_info()["items"] == 0
+
+
+def check_single_flight_threads():
+    """ 16 threads missing on the same key compute it once; a failure
+    reaches every waiter and is not cached """
+    computed = []
+    start = threading.Barrier(16)
+
+    @cached(policy=LFUCache)
+    def slow(key):
+        """ A slow computation """
+        computed.append(key)
+        time.sleep(0.1)
+        if key == "bad":
+            raise KeyError(key)
+        return key.upper()
+
+    results = []
+
+    def worker(key):
+        """ Call slow() once all threads are ready """
+        start.wait()
+        try:
+            results.append(slow(key))
+        except KeyError:
+            results.append("error")
+
+    for key in ("abc", "bad"):
+        threads = [threading.Thread(target=worker, args=(key,))
+                   for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert computed == ["abc", "bad"]
+    assert results == ["ABC"] * 16 + ["error"] * 16
+    assert slow.cache_info()["items"] == 1
+
+
+def check_single_flight_async():
+    """ Concurrent awaits of the same key share one coroutine; a
+    cancelled caller does not cancel it """
+    computed = []
+
+    @cached(ttl=0.2)
+    async def fetch(key):
+        """ A slow coroutine """
+        computed.append(key)
+        await asyncio.sleep(0.05)
+        return key * 2
+
+    async def main():
+        """ Fan out, cancel one caller, then let the TTL expire """
+        first = asyncio.ensure_future(fetch(21))
+        results = await asyncio.gather(*(fetch(21) for _ in range(50)))
+        assert results == [42] * 50 and computed == [21]
+        await asyncio.sleep(0)
+        assert first.done() and first.result() == 42
+        loser = asyncio.ensure_future(fetch(5))
+        await asyncio.sleep(0.01)
+        loser.cancel()
+        assert await fetch(5) == 10 and computed == [21, 5]
+        await asyncio.sleep(0.25)
+        assert await fetch(21) == 42 and computed == [21, 5, 21]
+
+    asyncio.run(main())
+
+
+def check_single_flight_loops():
+    """ Callers running their own event loops in other threads share
+    one coroutine, and none of the loops blocks while waiting """
+    computed = []
+    results = []
+    barrier = threading.Barrier(4)
+
+    @cached()
+    async def fetch(key):
+        """ A slow coroutine """
+        computed.append(key)
+        await asyncio.sleep(0.1)
+        return key * 2
+
+    async def caller():
+        """ Await fetch while a ticker checks that the loop runs """
+        ticks = []
+
+        async def ticker():
+            """ Count turns of the loop """
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        tick = asyncio.ensure_future(ticker())
+        barrier.wait()
+        result = await fetch(8)
+        tick.cancel()
+        results.append((result, len(ticks) > 3))
+
+    threads = [threading.Thread(target=asyncio.run, args=(caller(),))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert computed == [8] and results == [(16, True)] * 4, results
+
+
+if __name__ == "__main__":
+    check_memoization()
+    check_single_flight_threads()
+    check_single_flight_async()
+    check_single_flight_loops()
+    print("memoization, single-flight and TTL OK")
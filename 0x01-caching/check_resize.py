@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+""" Shrinking and growing a live cache, for every policy: evictions,
+on_evict calls and stats after each resize, and rejected limits """
+fixtures = __import__('fixtures')
+make = fixtures.make
+policies = fixtures.policies + fixtures.compact
+
+
+def fill(cache, keys):
+    """ Put then get every key, as a caller filling on miss would """
+    for key in keys:
+        if cache.get(key) is None:
+            cache.put(key, "v{}".format(key))
+
+
+def consistent(cache, log):
+    """ Counters, hook calls and contents agree with each other """
+    stats = cache.stats()
+    assert sum(stats["evictions"].values()) == len(log)
+    for reason in set(reason for _, reason in log):
+        assert stats["evictions"][reason] == \
+            sum(1 for _, r in log if r == reason)
+    assert stats["items"] == len(cache.cache_data)
+    assert stats["bytes"] == cache.used_bytes == \
+        sum(cache._sizes.get(key, 0) for key in cache.cache_data)
+    return stats
+
+
+def check_capacity(policy):
+    """ Lowering capacity evicts down to it, raising it stores more """
+    log = []
+    cache = make(policy, log, capacity=20)
+    fill(cache, range(20))
+    assert len(cache.cache_data) == 20 and not log
+    before = cache.stats()
+    cache.capacity = 5
+    stats = consistent(cache, log)
+    assert stats["items"] == 5 and log == [(key, "capacity")
+                                           for key, _ in log]
+    assert len(log) == 15 and not {k for k, _ in log} & set(cache.cache_data)
+    assert (stats["hits"], stats["misses"], stats["puts"]) == \
+        (before["hits"], before["misses"], before["puts"])
+    cache.capacity = 30
+    assert len(log) == 15, "growing evicts nothing"
+    fill(cache, range(100, 125))
+    assert len(cache.cache_data) == 30 and len(log) == 15, policy.__name__
+    fill(cache, range(200, 210))
+    stats = consistent(cache, log)
+    assert stats["items"] == 30 and len(log) == 25
+    cache.capacity = 0
+    stats = consistent(cache, log)
+    assert stats["items"] == 0 and len(log) == 55
+    cache.put("key", "value")
+    assert not cache.cache_data and cache.get("key") is None
+    cache.capacity = 3
+    fill(cache, range(3))
+    assert consistent(cache, log)["items"] == 3
+
+
+def check_max_bytes(policy):
+    """ Lowering max_bytes evicts for "bytes", lifting it stores more """
+    log = []
+    cache = make(policy, log, capacity=100, sizer=lambda key, item: 10)
+    fill(cache, range(50))
+    assert cache.used_bytes == 500 and not log
+    cache.max_bytes = 200
+    stats = consistent(cache, log)
+    assert stats["items"] == 20 and stats["bytes"] == 200
+    assert stats["evictions"] == {"bytes": 30}
+    cache.max_bytes = None
+    fill(cache, range(100, 180))
+    stats = consistent(cache, log)
+    assert stats["items"] == 100 and stats["bytes"] == 1000
+    assert stats["evictions"] == {"bytes": 30}
+    unsized = make(policy, log, capacity=10)
+    fill(unsized, range(10))
+    unsized.max_bytes = 10 ** 6
+    assert unsized.used_bytes == sum(unsized._sizes.values()) > 0
+
+
+def check_rejected(policy):
+    """ Negative or missing limits raise ValueError and change nothing """
+    for kwargs in ({"capacity": -1}, {"max_bytes": -1}):
+        try:
+            policy(on_evict=None, **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("{} accepted {}".format(policy.__name__,
+                                                         kwargs))
+    cache = policy(capacity=5, on_evict=None)
+    fill(cache, range(5))
+    for name, value in (("capacity", -1), ("capacity", None),
+                        ("max_bytes", -1)):
+        try:
+            setattr(cache, name, value)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("{}.{} = {}".format(policy.__name__, name,
+                                                     value))
+    assert (cache.capacity, cache.max_bytes) == (5, None)
+    assert len(cache.cache_data) == 5
+
+
+def check_basic():
+    """ BasicCache has no limit to change """
+    cache = fixtures.BasicCache(on_evict=None)
+    fill(cache, range(100))
+    for name in ("capacity", "max_bytes"):
+        try:
+            setattr(cache, name, 10)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("BasicCache.{} was set".format(name))
+    assert len(cache.cache_data) == 100 and not cache.evictions
+
+
+if __name__ == "__main__":
+    for policy in policies:
+        check_capacity(policy)
+        check_max_bytes(policy)
+        check_rejected(policy)
+    check_basic()
+    print("resizing evicts, reports and counts correctly for {} policies"
+          .format(len(policies)))
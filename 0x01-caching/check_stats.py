@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+""" stats() counters and the on_evict hook, for every policy """
+import contextlib
+import io
+import random
+policies = __import__('fixtures').policies
+
+
+def check_policy(policy):
+    """ Counters agree with what the caller and the hook observed """
+    evicted = []
+    cache = policy(capacity=20, max_bytes=3000,
+                   on_evict=lambda key, reason: evicted.append(reason))
+    cache.record_latency()
+    rng = random.Random(0)
+    hits = misses = 0
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for _ in range(5000):
+            key = rng.randrange(60)
+            if cache.get(key) is None:
+                misses += 1
+                cache.put(key, "x" * rng.randrange(1, 300))
+            else:
+                hits += 1
+    stats = cache.stats()
+    assert not output.getvalue(), "the hook replaces the DISCARD print"
+    assert (stats["hits"], stats["misses"]) == (hits, misses)
+    assert sum(stats["evictions"].values()) == len(evicted)
+    assert set(evicted) <= {"capacity", "bytes"}
+    assert stats["items"] == len(cache.cache_data)
+    assert stats["bytes"] == cache.used_bytes <= 3000
+    assert sum(stats["get_latency_ns"].values()) == 5000
+    assert sum(stats["put_latency_ns"].values()) == misses
+    cache.reset_stats()
+    assert cache.stats()["hits"] == 0
+    return stats
+
+
+if __name__ == "__main__":
+    print("{:<16}{:>8}{:>10}{:>12}{:>10}".format(
+        "policy", "hits", "misses", "capacity", "bytes"))
+    for policy in policies:
+        stats = check_policy(policy)
+        print("{:<16}{:>8}{:>10}{:>12}{:>10}".format(
+            policy.__name__, stats["hits"], stats["misses"],
+            stats["evictions"].get("capacity", 0),
+            stats["evictions"].get("bytes", 0)))
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+""" TTLCache against a fake clock: lazy expiry, per-key and default
+TTLs, and heap reaping that only touches due entries """
+import contextlib
+import os
+import time
+TTLCache = __import__('ttl_cache').TTLCache
+fixtures = __import__('fixtures')
+policies = [fixtures.BasicCache] + fixtures.policies
+
+
+class FakeClock():
+    """ A clock that only moves when told to """
+
+    def __init__(self):
+        """ Initialization """
+        self.now = 0.0
+
+    def __call__(self):
+        """ Current time """
+        return self.now
+
+
+def check_policy(policy):
+    """ Expiry semantics on top of one policy """
+    clock = FakeClock()
+    inner = policy()
+    if inner.capacity < 100:
+        inner.capacity = 100
+    cache = TTLCache(inner, default_ttl=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=30)
+    cache.default_ttl = None
+    cache.put("c", 3)
+    cache.put("d", 4, ttl=None)
+    clock.now = 9.9
+    assert cache.get("a") == 1 and cache.ttl("a") < 0.2
+    clock.now = 10
+    assert cache.get("a") is None and "a" not in cache.cache_data
+    cache.put("b", 5, ttl=50)
+    clock.now = 40
+    assert cache.reap() == 0 and cache.get("b") == 5
+    clock.now = 60
+    assert cache.reap() == 1 and "b" not in cache.cache_data
+    assert cache.get("c") == 3 and cache.get("d") == 4
+    assert cache.ttl("c") is None and not cache.expiry
+    assert cache.used_bytes == sum(cache._sizes.values())
+    assert cache.stats()["evictions"] == {"expired": 2}
+
+
+def check_reap_cost():
+    """ Reaping a few due entries out of many does not scan them all """
+    clock = FakeClock()
+    LRUCache = policies[3]
+    cache = TTLCache(LRUCache(capacity=10 ** 6, on_evict=None),
+                     clock=clock)
+    for key in range(200000):
+        cache.put(key, key, ttl=1000 + key)
+    clock.now = 1000 + 99
+    start = time.perf_counter()
+    removed = cache.reap()
+    elapsed = time.perf_counter() - start
+    assert removed == 100 and len(cache.cache_data) == 199900
+    print("reaped {} of 200000 entries in {:.2f} ms".format(
+        removed, elapsed * 1e3))
+
+
+def check_background_reaper():
+    """ The daemon thread frees expired entries without any get """
+    cache = TTLCache(policies[3](capacity=100, on_evict=None),
+                     default_ttl=0.05)
+    for key in range(10):
+        cache.put(key, key)
+    cache.start_reaper(0.01)
+    deadline = time.monotonic() + 2
+    while cache.cache_data and time.monotonic() < deadline:
+        time.sleep(0.01)
+    cache.stop_reaper()
+    assert not cache.cache_data and not cache.expiry
+
+
+def check_bounded():
+    """ Expiry state of evicted or refused entries is dropped, and a
+    reap only counts entries it removed """
+    clock = FakeClock()
+    evicted = []
+    cache = TTLCache(policies[3](capacity=10, max_bytes=10 ** 6,
+                                 on_evict=lambda k, r: evicted.append(k)),
+                     default_ttl=1000, clock=clock)
+    cache.put("huge", "x" * 2 * 10 ** 6)
+    for key in range(10000):
+        cache.put(key, key)
+    assert len(evicted) == 9990 and "huge" not in cache.expiry
+    assert set(cache.expiry) == set(cache.cache_data)
+    assert len(cache._deadlines) <= 2 * len(cache.expiry) + 65
+    cache.cache.delete(9999)
+    clock.now = 2000
+    assert cache.reap() == 9 and not cache.expiry
+
+
+if __name__ == "__main__":
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for policy in policies:
+            check_policy(policy)
+    print("expiry semantics OK for {} policies".format(len(policies)))
+    check_reap_cost()
+    check_bounded()
+    check_background_reaper()
+    print("background reaper OK")
@@ -0,0 +1,256 @@
+#!/usr/bin/python3
+""" Thread-safe caches built from the single-threaded policies
+"""
+import threading
+from collections import deque
+BaseCaching = __import__('base_caching').BaseCaching
+
+
+class LockedCache():
+    """ Serializes every call to a cache of any policy with one lock.
+
+    get() has to take the lock too: LRU, MRU, LFU and GDS all update
+    their bookkeeping on a hit.
+    """
+
+    def __init__(self, cache):
+        """ Initialization
+        """
+        self.cache = cache
+        self.lock = threading.RLock()
+
+    def __getattr__(self, name):
+        """ Attributes that need no locking are the wrapped cache's
+        """
+        return getattr(self.__dict__['cache'], name)
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        with self.lock:
+            self.cache.put(key, item)
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        with self.lock:
+            return self.cache.get(key)
+
+    def get_many(self, keys):
+        """ get() every key in order, in one hold of the lock
+        """
+        with self.lock:
+            return self.cache.get_many(keys)
+
+    def put_many(self, items):
+        """ put() every (key, item) in order, in one hold of the lock
+        """
+        with self.lock:
+            self.cache.put_many(items)
+
+    def delete(self, key, reason=None):
+        """ Remove an entry; return whether it was there
+        """
+        with self.lock:
+            return self.cache.delete(key, reason)
+
+    def print_cache(self):
+        """ Print the cache
+        """
+        with self.lock:
+            self.cache.print_cache()
+
+    def dump(self, path):
+        """ Save the cache; writers wait until it is written
+        """
+        with self.lock:
+            self.cache.dump(path)
+
+    def load(self, path):
+        """ Replace the content of the cache with a dump
+        """
+        with self.lock:
+            self.cache.load(path)
+
+
+class ShardedCache():
+    """ Splits keys by hash over `shards` independent caches of the
+    same `policy`, each behind its own lock, so threads working on
+    different keys rarely wait for each other.
+
+    `capacity` and `max_bytes` are totals, divided between the shards;
+    the policy is applied within each shard. Other keyword arguments
+    (e.g. sizer) go to every shard.
+
+    With `read_mostly`, a hit takes no lock at all: the item is read
+    straight from the shard and the key is queued, and the queued hits
+    are replayed through the policy's get() in batches, by whichever
+    thread next holds the shard's lock. Recency and frequency are then
+    only approximately up to date, in exchange for far less locking on
+    hits.
+    """
+    BATCH = 64
+
+    def __init__(self, policy, shards=16, capacity=None, max_bytes=None,
+                 read_mostly=False, **options):
+        """ Initialization
+        """
+        capacity = BaseCaching.MAX_ITEMS if capacity is None else capacity
+        if capacity < 1 or shards < 1:
+            raise ValueError("capacity and shards must be positive")
+        count = min(shards, capacity)
+        self.read_mostly = read_mostly
+        self.shards = []
+        for i in range(count):
+            limit = max_bytes and max_bytes // count + (i < max_bytes % count)
+            self.shards.append(policy(
+                capacity=capacity // count + (i < capacity % count),
+                max_bytes=limit, **options))
+        self.locks = [threading.Lock() for _ in self.shards]
+        self.hits = [deque() for _ in self.shards]
+
+    def _shard(self, key):
+        """ Index of the shard holding `key`
+        """
+        return hash(key) % len(self.shards)
+
+    def _replay(self, i):
+        """ Apply the queued hits of shard `i`; hold its lock
+        """
+        hits, shard = self.hits[i], self.shards[i]
+        for _ in range(len(hits)):
+            key = hits.popleft()
+            if key in shard.cache_data:
+                shard.get(key)
+            else:
+                # served, then evicted before its replay: still a hit
+                shard.hits += 1
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+        i = self._shard(key)
+        with self.locks[i]:
+            self._replay(i)
+            self.shards[i].put(key, item)
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None:
+            return None
+        i = self._shard(key)
+        if not self.read_mostly:
+            with self.locks[i]:
+                return self.shards[i].get(key)
+        item = self.shards[i].cache_data.get(key)
+        if item is None:
+            with self.locks[i]:
+                self.shards[i].misses += 1
+        else:
+            hits = self.hits[i]
+            hits.append(key)
+            if len(hits) >= self.BATCH and self.locks[i].acquire(False):
+                try:
+                    self._replay(i)
+                finally:
+                    self.locks[i].release()
+        return item
+
+    def _groups(self, pairs):
+        """ {shard index: [(key, value)...]} of (key, value) pairs, in
+        order within each shard; None keys are left out
+        """
+        groups = {}
+        for pair in pairs:
+            if pair[0] is not None:
+                groups.setdefault(self._shard(pair[0]), []).append(pair)
+        return groups
+
+    def get_many(self, keys):
+        """ get() every key in order; return {key: item} for the hits.
+        Keys are looked up shard by shard, each under its lock once
+        """
+        found = {}
+        for i, group in self._groups((key, None) for key in keys).items():
+            with self.locks[i]:
+                self._replay(i)
+                found.update(self.shards[i].get_many(
+                    [key for key, _ in group]))
+        return found
+
+    def put_many(self, items):
+        """ put() every (key, item) of a mapping or of an iterable of
+        pairs; each shard takes its share in order, under its lock once
+        """
+        items = items.items() if hasattr(items, 'items') else items
+        for i, group in self._groups(items).items():
+            with self.locks[i]:
+                self._replay(i)
+                self.shards[i].put_many(group)
+
+    def delete(self, key, reason=None):
+        """ Remove an entry; return whether it was there
+        """
+        if key is None:
+            return False
+        i = self._shard(key)
+        with self.locks[i]:
+            return self.shards[i].delete(key, reason)
+
+    def __len__(self):
+        """ Number of entries over all shards
+        """
+        return sum(len(shard.cache_data) for shard in self.shards)
+
+    @property
+    def cache_data(self):
+        """ A snapshot of every entry
+        """
+        data = {}
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                data.update(shard.cache_data)
+        return data
+
+    def print_cache(self):
+        """ Print the cache
+        """
+        data = self.cache_data
+        print("Current cache:")
+        for key in sorted(data.keys()):
+            print("{}: {}".format(key, data.get(key)))
+
+    def stats(self):
+        """ Counters and sizes summed over the shards; with read_mostly,
+        hits are counted once replayed
+        """
+        total = {"hits": 0, "misses": 0, "puts": 0, "evictions": {},
+                 "items": 0, "bytes": 0}
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                stats = shard.stats()
+            for name in ("hits", "misses", "puts", "items", "bytes"):
+                total[name] += stats[name]
+            for reason, count in stats["evictions"].items():
+                total["evictions"][reason] = (
+                    total["evictions"].get(reason, 0) + count)
+        gets = total["hits"] + total["misses"]
+        total["hit_rate"] = total["hits"] / gets if gets else None
+        return total
+
+    def memory_usage(self):
+        """ Accounting summed over the shards
+        """
+        total = {}
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                usage = shard.memory_usage()
+            for name, value in usage.items():
+                if value is None or total.get(name, 0) is None:
+                    total[name] = None
+                else:
+                    total[name] = total.get(name, 0) + value
+        return total
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+""" Cache policies and constructors shared by the check_ and bench_
+scripts """
+BasicCache = __import__('0-basic_cache').BasicCache
+policies = [
+    __import__('1-fifo_cache').FIFOCache,
+    __import__('2-lifo_cache').LIFOCache,
+    __import__('3-lru_cache').LRUCache,
+    __import__('4-mru_cache').MRUCache,
+    __import__('100-lfu_cache').LFUCache,
+    __import__('gds_cache').GDSCache,
+    __import__('arc_cache').ARCCache,
+    __import__('two_queue_cache').TwoQueueCache,
+    __import__('tinylfu_cache').WTinyLFUCache,
+]
+compact = [
+    __import__('compact_cache').CompactLRUCache,
+    __import__('compact_cache').CompactMRUCache,
+]
+
+
+def make(policy, log, capacity=50, max_bytes=None, **kwargs):
+    """ A cache recording its evictions in `log` as (key, reason); a
+    BasicCache takes no limits """
+    def on_evict(key, reason):
+        """ Record an eviction """
+        log.append((key, reason))
+    if policy is BasicCache:
+        return policy(on_evict=on_evict, **kwargs)
+    return policy(capacity=capacity, max_bytes=max_bytes,
+                  on_evict=on_evict, **kwargs)
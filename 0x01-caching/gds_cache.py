@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+""" GreedyDual-Size caching module
+"""
+import heapq
+import sys
+from itertools import count
+BaseCaching = __import__('base_caching').BaseCaching
+default_sizer = __import__('base_caching').default_sizer
+
+
+class GDSCache(BaseCaching):
+    """ GreedyDual-Size: a size-adjusted LRU for items of mixed sizes.
+
+    Every entry gets a priority H = L + cost / size when it is put or
+    read, where L is the priority of the last evicted entry. The entry
+    with the lowest H is evicted, so large entries leave first unless
+    they are used often, and entries that are not touched age as L
+    rises. `cost(key, item)` defaults to 1; ties go to the oldest H.
+    Priorities live in a heap with lazy deletion: O(log n) per put/get.
+    Entries are always sized, with default_sizer unless given a sizer.
+    """
+
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard, cost=None):
+        """ Initialization
+        """
+        super().__init__(capacity, max_bytes,
+                         default_sizer if sizer is None else sizer, on_evict)
+        self.cost = cost
+        self.inflation = 0.0
+        self.priority = {}
+        self._heap = []
+        self._tick = count()
+
+    def _touch(self, key):
+        """ Give `key` a fresh priority
+        """
+        cost = 1 if self.cost is None else self.cost(key,
+                                                     self.cache_data[key])
+        size = max(self._sizes.get(key, 1), 1)
+        entry = (self.inflation + cost / size, next(self._tick), key)
+        self.priority[key] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self.priority) + 64:
+            self._heap = list(self.priority.values())
+            heapq.heapify(self._heap)
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+
+        size = None
+        if key not in self.cache_data:
+            size = self._make_room(key, item)
+            if size is None:
+                return
+        self._store(key, item, size)
+        self._touch(key)
+        self._shrink()
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(key)
+        return self.cache_data[key]
+
+    def _state(self):
+        """ Priorities and inflation; the heap is rebuilt from them
+        """
+        return {"priority": self.priority, "inflation": self.inflation}
+
+    def _set_state(self, state):
+        """ Restore what _state returned
+        """
+        super()._set_state(state)
+        self._heap = list(self.priority.values())
+        heapq.heapify(self._heap)
+        self._tick = count(max((entry[1] for entry in self._heap),
+                               default=-1) + 1)
+
+    def _evict(self):
+        """ Remove the entry with the lowest priority
+        """
+        while True:
+            entry = heapq.heappop(self._heap)
+            if self.priority.get(entry[2]) is entry:
+                break
+        self.inflation = entry[0]
+        self._remove(entry[2])
+        return entry[2]
+
+    def _remove(self, key):
+        """ Forget an entry; its heap entry is dropped lazily
+        """
+        del self.priority[key]
+        del self.cache_data[key]
+
+    def memory_usage(self):
+        """ Accounting of this instance, including the priority heap
+        """
+        usage = super().memory_usage()
+        usage["overhead_bytes"] += (sys.getsizeof(self.priority) +
+                                    sys.getsizeof(self._heap))
+        return usage
@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+""" Cache-backed loading with stampede protection
+"""
+import math
+import random
+import threading
+import time
+_Call = __import__('memoize')._Call
+
+
+class LoadingCache():
+    """ get_or_load(key, loader) over a cache of any policy.
+
+    Values are kept for `ttl` seconds (forever if None). Concurrent
+    misses on a key are coalesced: one caller runs the loader, the
+    others wait for its result. Around expiry:
+    - XFetch: a fresh value is refreshed early with a probability that
+      grows as expiry nears, the more so the longer the loader took
+      (and `beta` is large), so hot keys rarely expire at all
+    - stale-while-revalidate: for `stale_ttl` seconds after expiry, the
+      old value is still served while one background thread reloads it
+    Both kinds of refresh run in the background, at most one per key;
+    if one fails, the old value stays. get, get_many, put and put_many
+    read and write plain values with the same expiry, without loading.
+    `clock` returns seconds (time.monotonic by default).
+    """
+
+    def __init__(self, cache, ttl=None, stale_ttl=0, beta=1.0, clock=None,
+                 rng=None):
+        """ Initialization
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be None or positive")
+        self.cache = cache
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.beta = beta
+        self.clock = time.monotonic if clock is None else clock
+        self.random = (random.Random() if rng is None else rng).random
+        self.loads = 0
+        self.refreshes = 0
+        self.stale_hits = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._refreshing = set()
+
+    def __getattr__(self, name):
+        """ Everything else is the wrapped cache's
+        """
+        return getattr(self.__dict__['cache'], name)
+
+    def get_or_load(self, key, loader):
+        """ The value of `key`, from the cache or else from loader(key)
+        """
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                value, expiry, delta = entry
+                now = self.clock()
+                if expiry is None:
+                    return value
+                if now < expiry:
+                    if self._early(now, expiry, delta):
+                        self._refresh(key, loader)
+                    return value
+                if now < expiry + self.stale_ttl:
+                    self.stale_hits += 1
+                    self._refresh(key, loader)
+                    return value
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            return call.wait()
+        try:
+            call.result = self._load(key, loader)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def get(self, key):
+        """ The value of `key` if cached and not expired, else None; never
+        loads
+        """
+        with self._lock:
+            return self._fresh(self.cache.get(key), self.clock())
+
+    def get_many(self, keys):
+        """ get() every key, through the wrapped cache's get_many; return
+        {key: value} for the fresh ones
+        """
+        with self._lock:
+            now = self.clock()
+            found = {}
+            for key, entry in self.cache.get_many(keys).items():
+                value = self._fresh(entry, now)
+                if value is not None:
+                    found[key] = value
+            return found
+
+    def put(self, key, value):
+        """ Cache a value obtained without a loader, for `ttl` seconds
+        """
+        self.put_many(((key, value),))
+
+    def put_many(self, items):
+        """ put() every (key, value) of a mapping or of an iterable of
+        pairs, through the wrapped cache's put_many
+        """
+        items = items.items() if hasattr(items, 'items') else items
+        with self._lock:
+            now = self.clock()
+            expiry = None if self.ttl is None else now + self.ttl
+            # no loader ran, so there is no cost for XFetch to weigh
+            self.cache.put_many([(key, None if value is None
+                                  else (value, expiry, 0.0))
+                                 for key, value in items])
+
+    @staticmethod
+    def _fresh(entry, now):
+        """ Value of a cached (value, expiry, delta) entry, None if absent
+        or expired
+        """
+        if entry is None:
+            return None
+        value, expiry, _ = entry
+        return value if expiry is None or now < expiry else None
+
+    def _early(self, now, expiry, delta):
+        """ XFetch draw: whether to refresh a value that is still fresh
+        """
+        return now - delta * self.beta * math.log(1 - self.random()) >= \
+            expiry
+
+    def _load(self, key, loader):
+        """ Run the loader and cache its value with its cost
+        """
+        start = self.clock()
+        value = loader(key)
+        now = self.clock()
+        expiry = None if self.ttl is None else now + self.ttl
+        with self._lock:
+            self.loads += 1
+            if value is not None:
+                self.cache.put(key, (value, expiry, now - start))
+        return value
+
+    def _refresh(self, key, loader):
+        """ Reload `key` in a background thread unless one already is;
+        hold the lock
+        """
+        if key in self._refreshing or key in self._calls:
+            return
+        self._refreshing.add(key)
+        self.refreshes += 1
+        threading.Thread(target=self._background, args=(key, loader),
+                         daemon=True).start()
+
+    def _background(self, key, loader):
+        """ Body of a background refresh
+        """
+        try:
+            self._load(key, loader)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key):
+        """ Drop `key`; the next request loads it again
+        """
+        with self._lock:
+            return self.cache.delete(key)
+
+    def stats(self):
+        """ The cache's stats() plus loader counters
+        """
+        with self._lock:
+            stats = self.cache.stats()
+        stats.update(loads=self.loads, refreshes=self.refreshes,
+                     stale_hits=self.stale_hits, errors=self.errors)
+        return stats
@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+""" Memoization on top of the caching policies
+"""
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+LRUCache = __import__('3-lru_cache').LRUCache
+TTLCache = __import__('ttl_cache').TTLCache
+
+_KWARGS = object()
+
+
+class _Key(list):
+    """ A call key that hashes itself only once, since it is looked up
+    in the cache and then in the calls in flight
+    """
+    __slots__ = ('hashvalue',)
+
+    def __init__(self, items):
+        """ Initialization; raises TypeError if an item is unhashable
+        """
+        self[:] = items
+        self.hashvalue = hash(items)
+
+    def __hash__(self):
+        """ The precomputed hash
+        """
+        return self.hashvalue
+
+
+def make_key(args, kwargs):
+    """ Hashable key of a call: a lone int or str argument is its own
+    key; keyword order does not matter
+    """
+    if kwargs:
+        args += (_KWARGS,) + tuple(sorted(kwargs.items()))
+    elif len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+    return _Key(args)
+
+
+class _Call():
+    """ A computation in flight that other callers of the same key wait
+    for instead of starting their own
+    """
+
+    def __init__(self):
+        """ Initialization
+        """
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        """ The leader's result, or its exception raised again
+        """
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _running_future():
+    """ A Future that coroutines of any event loop can await, and that
+    none of them can cancel by being cancelled themselves
+    """
+    future = concurrent.futures.Future()
+    future.set_running_or_notify_cancel()
+    return future
+
+
+def cached(policy=LRUCache, capacity=128, ttl=None, max_bytes=None,
+           sizer=None):
+    """ Decorator memoizing a function, or an `async def` function, in a
+    cache of the given `policy`, optionally expiring results after `ttl`
+    seconds.
+
+    Concurrent calls with the same arguments are deduplicated: one of
+    them computes, the others wait for its result (or exception), which
+    is not cached when it fails. Calls with unhashable arguments are
+    not memoized. Results, None included, are shared between callers:
+    do not mutate them. The wrapper has `cache`, `cache_clear()` and
+    `cache_info()` (the cache's stats()).
+    """
+    def decorator(function):
+        """ The actual decorator
+        """
+        cache = policy(capacity=capacity, max_bytes=max_bytes, sizer=sizer,
+                       on_evict=None)
+        if ttl is not None:
+            cache = TTLCache(cache, ttl)
+        lock = threading.Lock()
+        calls = {}
+
+        def lookup(key, new_call=_Call):
+            """ (cached result, call in flight, whether to compute) """
+            with lock:
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry, None, False
+                call = calls.get(key)
+                if call is not None:
+                    return None, call, False
+                call = calls[key] = new_call()
+                return None, call, True
+
+        def store(key, result):
+            """ Cache a result computed for `key` """
+            with lock:
+                # boxed, so that None results are cached too
+                cache.put(key, (result,))
+                return calls.pop(key)
+
+        def forget(key):
+            """ End a failed computation for `key` """
+            with lock:
+                return calls.pop(key)
+
+        def settle(key, future, task):
+            """ Cache the result of a finished task and hand it to the
+            callers waiting for it """
+            if task.cancelled():
+                forget(key)
+                future.set_exception(asyncio.CancelledError())
+            elif task.exception() is not None:
+                forget(key)
+                future.set_exception(task.exception())
+            else:
+                store(key, task.result())
+                future.set_result(task.result())
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                """ Memoized coroutine """
+                try:
+                    key = make_key(args, kwargs)
+                    entry, future, leader = lookup(key, _running_future)
+                except TypeError:
+                    return await function(*args, **kwargs)
+                if entry is not None:
+                    return entry[0]
+                if leader:
+                    task = asyncio.ensure_future(function(*args, **kwargs))
+                    task.add_done_callback(
+                        lambda task: settle(key, future, task))
+                # callers may run other event loops, in other threads;
+                # the task outlives any of them that is cancelled
+                return await asyncio.wrap_future(future)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                """ Memoized function """
+                try:
+                    key = make_key(args, kwargs)
+                    entry, call, leader = lookup(key)
+                except TypeError:
+                    return function(*args, **kwargs)
+                if entry is not None:
+                    return entry[0]
+                if not leader:
+                    return call.wait()
+                try:
+                    call.result = function(*args, **kwargs)
+                except BaseException as e:
+                    call.error = e
+                    forget(key)
+                    raise
+                else:
+                    store(key, call.result)
+                    return call.result
+                finally:
+                    call.done.set()
+
+        def cache_clear():
+            """ Empty the cache """
+            with lock:
+                for key in list(cache.cache_data):
+                    cache.delete(key)
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_info = cache.stats
+        return wrapper
+    return decorator
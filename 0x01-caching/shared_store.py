@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+""" A key-value store shared by the processes of a host
+"""
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+
+
+def default_directory():
+    """ Where stores live unless told otherwise: a directory of the
+    current user's in XDG_RUNTIME_DIR, else in /dev/shm (memory, not
+    disk) when the host has it, else in the temporary directory
+    """
+    root = os.environ.get('XDG_RUNTIME_DIR')
+    if not root or not os.path.isdir(root):
+        root = '/dev/shm' if os.path.isdir('/dev/shm') \
+            else tempfile.gettempdir()
+    return os.path.join(root, 'cache-store-{}'.format(os.getuid()))
+
+
+def private_directory(directory):
+    """ Create `directory` readable by its owner only if it is missing;
+    raise PermissionError if it is not a directory of the current user
+    that only they can write to, since stores unpickle what it holds
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError("{} is not a directory of the current user"
+                              .format(directory))
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError("{} is writable by other users"
+                              .format(directory))
+    return directory
+
+
+class FileStore():
+    """ One file per entry in `directory`, named after a hash of the
+    pickled key, so every process opening the same directory sees the
+    same entries. Writes go to a temporary file renamed into place,
+    so readers get an entry whole or not at all.
+
+    Keys must pickle the same way in every process (str, int, bytes and
+    tuples of them do). Entries are unpickled on read, so the directory
+    must belong to the current user and be writable by them only.
+    With `max_bytes`, every TRIM_EVERY puts of a process the oldest
+    written entries are removed until the store fits.
+    """
+    TRIM_EVERY = 256
+
+    def __init__(self, directory=None, max_bytes=None):
+        """ Initialization
+        """
+        self.directory = private_directory(
+            default_directory() if directory is None else directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+
+    def _path(self, key):
+        """ File of `key`
+        """
+        digest = hashlib.blake2b(pickle.dumps(key, pickle.HIGHEST_PROTOCOL),
+                                 digest_size=16).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                stored_key, item = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            stored_key = item = None
+        if item is None or stored_key != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item
+
+    def put(self, key, item):
+        """ Add an item in the store
+        """
+        if key is None or item is None:
+            return
+        path = self._path(key)
+        # a name of its own, even for threads writing the same key
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, item), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.puts += 1
+        if self.max_bytes is not None and self.puts % self.TRIM_EVERY == 0:
+            self.trim()
+
+    def delete(self, key):
+        """ Remove an entry; return whether it was there
+        """
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _entries(self):
+        """ (mtime, size, path) of every entry
+        """
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def trim(self):
+        """ Remove the oldest written entries until within max_bytes
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """ Remove every entry
+        """
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        """ This process's counters
+        """
+        gets = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / gets if gets else None,
+                "puts": self.puts}
+
+    def memory_usage(self):
+        """ Entries and bytes of the whole store, all processes together
+        """
+        entries = self._entries()
+        return {"items": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes}
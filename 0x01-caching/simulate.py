@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+"""
+Cache policy simulator
+
+Replays access traces against cache policies at several capacities and
+reports, for every trace, the hit-rate curve of each policy plus its
+replay speed and the memory it ends up holding, entries and
+bookkeeping included (measured with tracemalloc, in a second replay so
+that tracing does not slow the timed one). Simulations run in parallel
+in a process pool:
+
+    ./simulate.py --traces zipf scan loop pagination --capacities 100 1000
+    ./simulate.py --policies lru arc my_module:MyCache --traces file:keys.txt
+    ./simulate.py --traces pagination --save-trace pages.txt
+
+A trace file holds one key per line; a line of several words is a tuple
+key, and words that are integers are read as ints.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+cached = __import__('memoize').cached
+workloads = __import__('workloads')
+
+POLICIES = {
+    "fifo": ('1-fifo_cache', 'FIFOCache'),
+    "lifo": ('2-lifo_cache', 'LIFOCache'),
+    "lru": ('3-lru_cache', 'LRUCache'),
+    "mru": ('4-mru_cache', 'MRUCache'),
+    "lfu": ('100-lfu_cache', 'LFUCache'),
+    "gds": ('gds_cache', 'GDSCache'),
+    "arc": ('arc_cache', 'ARCCache'),
+    "2q": ('two_queue_cache', 'TwoQueueCache'),
+    "tinylfu": ('tinylfu_cache', 'WTinyLFUCache'),
+    "compact-lru": ('compact_cache', 'CompactLRUCache'),
+    "compact-mru": ('compact_cache', 'CompactMRUCache'),
+}
+# argument types of each synthetic trace spec
+TRACES = {
+    "zipf": (int, float),
+    "scan": (int,),
+    "loop": (int,),
+    "pagination": (),
+}
+
+
+def policy_class(spec):
+    """ Cache class of a policy name, or of `module:Class` for a
+    BaseCaching subclass defined anywhere on sys.path
+    """
+    if spec in POLICIES:
+        module, name = POLICIES[spec]
+    elif ':' in spec:
+        module, name = spec.split(':', 1)
+    else:
+        raise ValueError("unknown policy {!r}: use one of {} or "
+                         "module:Class".format(spec, ", ".join(POLICIES)))
+    return getattr(__import__(module), name)
+
+
+def parse_trace(spec):
+    """ (name, arguments) of a trace spec: zipf[:keys[:skew]],
+    scan[:keys], loop[:keys], pagination or file:PATH; raise ValueError
+    for a bad spec or a trace file that cannot be read """
+    name, _, rest = spec.partition(':')
+    if name == "file":
+        try:
+            with open(rest):
+                pass
+        except OSError as e:
+            raise ValueError("trace {!r}: cannot read {!r}: {}".format(
+                spec, rest, e.strerror or e))
+        return name, [rest]
+    if name not in TRACES:
+        raise ValueError("unknown trace {!r}: use zipf[:keys[:skew]], "
+                         "scan[:keys], loop[:keys], pagination or "
+                         "file:PATH".format(spec))
+    words = rest.split(':') if rest else []
+    if len(words) > len(TRACES[name]):
+        raise ValueError("trace {!r}: {} takes at most {} arguments"
+                         .format(spec, name, len(TRACES[name])))
+    try:
+        args = [kind(word) for kind, word in zip(TRACES[name], words)]
+    except ValueError:
+        raise ValueError("trace {!r}: bad arguments".format(spec))
+    if args and args[0] <= 0:
+        raise ValueError("trace {!r}: keys must be positive".format(spec))
+    return name, args
+
+
+@cached(capacity=4)
+def load_trace(spec, length):
+    """ Keys of a trace spec, built once per process """
+    name, args = parse_trace(spec)
+    if name == "file":
+        return workloads.read_trace(args[0])
+    if name == "pagination":
+        return workloads.pagination(length)
+    if name == "zipf":
+        return workloads.zipf(args[0] if args else 10000, length, *args[1:])
+    if name == "scan":
+        return workloads.scan(args[0] if args else 10000, length)[:length]
+    return workloads.loop(args[0] if args else 1250, length)
+
+
+def replay(cache, trace):
+    """ Number of hits of a cache filled on miss """
+    get, put = cache.get, cache.put
+    hits = 0
+    for key in trace:
+        if get(key) is None:
+            put(key, True)
+        else:
+            hits += 1
+    return hits
+
+
+def simulate(task):
+    """ Replay a trace through a cache filled on miss; task is
+    (policy, capacity, trace spec, trace length) """
+    policy, capacity, spec, length = task
+    trace = load_trace(spec, length)
+    cache_class = policy_class(policy)
+    cache = cache_class(capacity=capacity, on_evict=None)
+    start = time.perf_counter()
+    hits = replay(cache, trace)
+    elapsed = time.perf_counter() - start
+    items = len(cache.cache_data)
+    del cache
+    tracemalloc.start()
+    cache = cache_class(capacity=capacity, on_evict=None)
+    replay(cache, trace)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        "policy": policy,
+        "capacity": capacity,
+        "trace": spec,
+        "accesses": len(trace),
+        "hit_rate": hits / len(trace) if trace else None,
+        "ops_per_s": len(trace) / elapsed if elapsed else None,
+        "items": items,
+        "memory_bytes": memory,
+    }
+
+
+def run(tasks, jobs):
+    """ Results of every task, in a pool of `jobs` processes (in this
+    process if 1) """
+    if jobs == 1:
+        return [simulate(task) for task in tasks]
+    with ProcessPoolExecutor(jobs) as pool:
+        return list(pool.map(simulate, tasks))
+
+
+def report(results, policies, capacities, traces):
+    """ Per trace: hit rate of every policy at every capacity, then the
+    ops/s (median over capacities) and memory at the largest capacity """
+    found = {(r["trace"], r["policy"], r["capacity"]): r for r in results}
+    for spec in traces:
+        print("\n{} ({} accesses)".format(
+            spec, found[spec, policies[0], capacities[0]]["accesses"]))
+        print("{:<14}".format("policy") +
+              "".join("{:>9}".format(c) for c in capacities) +
+              "{:>12}{:>14}".format("ops/s", "memory B"))
+        for policy in policies:
+            rows = [found[spec, policy, c] for c in capacities]
+            speeds = sorted(row["ops_per_s"] or 0 for row in rows)
+            print("{:<14}".format(policy) +
+                  "".join("{:>9.1%}".format(row["hit_rate"] or 0)
+                          for row in rows) +
+                  "{:>12.0f}{:>14}".format(speeds[len(speeds) // 2],
+                                           rows[-1]["memory_bytes"]))
+
+
+def main():
+    """ Command line entry point """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument("--policies", nargs='+',
+                        default=["fifo", "lifo", "lru", "mru", "lfu"],
+                        help="policy names or module:Class (default: "
+                             "fifo lifo lru mru lfu)")
+    parser.add_argument("--traces", nargs='+', default=["zipf", "scan",
+                                                        "loop"],
+                        help="zipf[:keys[:skew]], scan[:keys], loop[:keys],"
+                             " pagination or file:PATH")
+    parser.add_argument("--capacities", nargs='+', type=int,
+                        default=[100, 250, 500, 1000, 2000])
+    parser.add_argument("--length", type=int, default=200000,
+                        help="accesses of synthetic traces")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--output", help="also write the results as JSON")
+    parser.add_argument("--save-trace", metavar="PATH",
+                        help="write the first trace to PATH and exit")
+    args = parser.parse_args()
+
+    def fail(message):
+        """ Exit on a one-line error, before any worker starts """
+        parser.exit(2, "{}: error: {}\n".format(parser.prog, message))
+
+    for spec in args.traces:
+        try:
+            parse_trace(spec)
+        except ValueError as e:
+            fail(e)
+    if args.length <= 0:
+        fail("--length must be positive")
+    if args.save_trace:
+        workloads.write_trace(args.save_trace,
+                              load_trace(args.traces[0], args.length))
+        return
+    for policy in args.policies:
+        try:
+            policy_class(policy)
+        except (ValueError, ImportError, AttributeError) as e:
+            fail(e)
+    if min(args.capacities) < 0:
+        fail("--capacities must not be negative")
+    args.capacities.sort()
+    tasks = [(policy, capacity, spec, args.length)
+             for spec in args.traces
+             for policy in args.policies
+             for capacity in args.capacities]
+    start = time.perf_counter()
+    results = run(tasks, max(args.jobs or 1, 1))
+    report(results, args.policies, args.capacities, args.traces)
+    print("\n{} simulations in {:.1f}s on {} processes".format(
+        len(tasks), time.perf_counter() - start, max(args.jobs or 1, 1)))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
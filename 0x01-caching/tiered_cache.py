@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+""" Two-tier caching: a small per-process policy cache in front of a
+store shared by every process of the host
+"""
+FileStore = __import__('shared_store').FileStore
+
+
+class TieredCache():
+    """ `l1` is a cache of any policy, private to the process; `l2` is
+    shared (a FileStore unless given).
+
+    get() tries l1, then l2; an l2 hit is promoted into l1. With a
+    `loader`, a miss in both is read through: loader(key) is called and
+    its result put() in the cache.
+
+    put() writes through to l2 right away by default. With
+    `write_through=False` it only writes l1 and an entry reaches l2
+    when l1 evicts it (demotion) or on flush(): fewer l2 writes, but
+    other processes see the entry later.
+    """
+
+    def __init__(self, l1, l2=None, loader=None, write_through=True):
+        """ Initialization
+        """
+        self.l1 = l1
+        self.l2 = FileStore() if l2 is None else l2
+        self.loader = loader
+        self.write_through = write_through
+        self.loads = 0
+        self._dirty = {}
+        self._on_evict = l1.on_evict
+        l1.on_evict = self._demote
+
+    def get(self, key):
+        """ Get an item by key from the nearest tier holding it
+        """
+        item = self.l1.get(key)
+        if item is not None:
+            return item
+        item = self.l2.get(key)
+        if item is not None:
+            self.l1.put(key, item)
+            return item
+        if self.loader is None or key is None:
+            return None
+        item = self.loader(key)
+        self.loads += 1
+        self.put(key, item)
+        return item
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+        if self.write_through:
+            self.l2.put(key, item)
+        else:
+            self._dirty[key] = item
+        self.l1.put(key, item)
+        if key in self._dirty and key not in self.l1.cache_data:
+            # too big for l1: straight to l2
+            self.l2.put(key, self._dirty.pop(key))
+
+    def delete(self, key):
+        """ Remove an entry from both tiers; return whether it was in
+        either
+        """
+        self._dirty.pop(key, None)
+        in_l1 = self.l1.delete(key)
+        return self.l2.delete(key) or in_l1
+
+    def flush(self):
+        """ Write the entries not yet in l2 (write-back mode)
+        """
+        dirty, self._dirty = self._dirty, {}
+        for key, item in dirty.items():
+            self.l2.put(key, item)
+
+    def _demote(self, key, reason):
+        """ l1 eviction hook: an entry l2 has not seen yet goes there
+        """
+        item = self._dirty.pop(key, None)
+        if item is not None:
+            self.l2.put(key, item)
+        if self._on_evict is not None:
+            self._on_evict(key, reason)
+
+    def stats(self):
+        """ Counters of both tiers and of the loader
+        """
+        return {"l1": self.l1.stats(), "l2": self.l2.stats(),
+                "loads": self.loads}
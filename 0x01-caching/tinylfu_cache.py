@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+""" W-TinyLFU caching module
+"""
+import pickle
+import zlib
+from collections import OrderedDict
+BaseCaching = __import__('base_caching').BaseCaching
+
+
+def stable_hash(key):
+    """ A hash of `key` that is the same in every process, unlike the
+    salted hash() of str and bytes, so that a dumped sketch still counts
+    the same keys once loaded elsewhere: ints hash to themselves, other
+    keys to the CRC-32 of their UTF-8 or pickled form
+    """
+    if isinstance(key, int):
+        return hash(key)
+    if isinstance(key, str):
+        data = key.encode('utf-8', 'surrogatepass')
+    elif isinstance(key, bytes):
+        data = key
+    else:
+        data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+    return zlib.crc32(data)
+
+
+class FrequencySketch():
+    """ Approximate access counts in a fixed amount of memory.
+
+    A count-min sketch of DEPTH rows of saturating 4-bit counters
+    (one per byte), fronted by a doorkeeper bit set so that keys seen
+    only once never reach the counters. Every `sample` recorded
+    accesses, all counters are halved and the doorkeeper is cleared, so
+    old popularity fades.
+    """
+    DEPTH = 4
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+             0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAXIMUM = 15
+    BITS64 = (1 << 64) - 1
+
+    def __init__(self, capacity):
+        """ Initialization, sized for about `capacity` distinct keys
+        """
+        width = 16
+        while width < capacity:
+            width *= 2
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in range(self.DEPTH)]
+        self.doorkeeper = bytearray(width * 4 // 8)
+        self.sample = 10 * max(capacity, 1)
+        self.additions = 0
+
+    def _indexes(self, h):
+        """ One counter index per row, for a key of stable_hash `h`
+        """
+        return [(((h * seed) & self.BITS64) >> 32) & self.mask
+                for seed in self.SEEDS]
+
+    def _doorkeeper_bits(self, h):
+        """ Two bit positions in the doorkeeper, for a key of stable_hash
+        `h`
+        """
+        h = (h * self.SEEDS[-1]) & self.BITS64
+        bits = len(self.doorkeeper) * 8
+        return h % bits, (h >> 32) % bits
+
+    def _in_doorkeeper(self, bits):
+        """ Whether both doorkeeper `bits` of a key are set, i.e. it was
+        (probably) recorded since the last reset
+        """
+        return all(self.doorkeeper[bit >> 3] & (1 << (bit & 7))
+                   for bit in bits)
+
+    def increment(self, key):
+        """ Record one access to `key`
+        """
+        h = stable_hash(key)
+        bits = self._doorkeeper_bits(h)
+        if not self._in_doorkeeper(bits):
+            for bit in bits:
+                self.doorkeeper[bit >> 3] |= 1 << (bit & 7)
+        else:
+            for row, i in zip(self.rows, self._indexes(h)):
+                if row[i] < self.MAXIMUM:
+                    row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample:
+            self.reset()
+
+    def estimate(self, key):
+        """ Approximate number of recent accesses to `key`
+        """
+        h = stable_hash(key)
+        count = min(row[i] for row, i in zip(self.rows, self._indexes(h)))
+        return count + self._in_doorkeeper(self._doorkeeper_bits(h))
+
+    def reset(self):
+        """ Age every count by half
+        """
+        halve = bytes(value >> 1 for value in range(256))
+        self.rows = [row.translate(halve) for row in self.rows]
+        self.doorkeeper = bytearray(len(self.doorkeeper))
+        self.additions //= 2
+
+
+class WTinyLFUCache(BaseCaching):
+    """ Window TinyLFU (Einziger, Friedman & Manes).
+
+    New keys enter a small LRU window (WINDOW_RATIO of the cache). When
+    the cache is full, the key leaving the window must beat the main
+    cache's victim on estimated frequency to be admitted, so keys used
+    once, like a bulk scan, are turned away at the door. The main cache
+    is a segmented LRU: a hit in `probation` promotes a key to
+    `protected` (PROTECTED_RATIO of the main cache), whose overflow is
+    demoted back to probation.
+    """
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
+        """ Initialization
+        """
+        super().__init__(capacity, max_bytes, sizer, on_evict)
+        self.sketch = FrequencySketch(self._capacity)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+
+    def _window_size(self):
+        """ Target number of keys in the window
+        """
+        return max(1, int(self._capacity * self.WINDOW_RATIO))
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+
+        if key in self.cache_data:
+            self._hit(key)
+            self._store(key, item)
+            self._shrink()
+            return
+        size = self._size(key, item)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        self.sketch.increment(key)
+        self._store(key, item, size)
+        self.window[key] = None
+        # while there is room, keys leave the window without a duel
+        main = self._capacity - self._window_size()
+        while (len(self.window) > self._window_size() and
+               len(self.probation) + len(self.protected) < main):
+            moved, _ = self.window.popitem(last=False)
+            self.probation[moved] = None
+        self._shrink()
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None:
+            self.misses += 1
+            return None
+        self.sketch.increment(key)
+        if key not in self.cache_data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._hit(key)
+        return self.cache_data[key]
+
+    def _state(self):
+        """ Segments and frequency sketch
+        """
+        return {"window": self.window, "probation": self.probation,
+                "protected": self.protected, "sketch": self.sketch}
+
+    def _hit(self, key):
+        """ Update the segments for a resident key that was used again
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        else:
+            del self.probation[key]
+            self.protected[key] = None
+            limit = max(1, int((self._capacity - self._window_size()) *
+                               self.PROTECTED_RATIO))
+            while len(self.protected) > limit:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+
+    def _evict(self):
+        """ The window's oldest key and the main cache's victim duel on
+        frequency; the loser is evicted
+        """
+        main = self.probation or self.protected
+        if self.window and (not main or
+                            len(self.window) > self._window_size()):
+            candidate, _ = self.window.popitem(last=False)
+            if not main:
+                del self.cache_data[candidate]
+                return candidate
+            victim = next(iter(main))
+            estimate = self.sketch.estimate
+            if estimate(candidate) > estimate(victim):
+                del main[victim]
+                self.probation[candidate] = None
+                candidate = victim
+            del self.cache_data[candidate]
+            return candidate
+        victim, _ = main.popitem(last=False)
+        del self.cache_data[victim]
+        return victim
+
+    def _remove(self, key):
+        """ Forget a key; its frequency fades out of the sketch
+        """
+        for segment in (self.window, self.probation, self.protected):
+            segment.pop(key, None)
+        del self.cache_data[key]
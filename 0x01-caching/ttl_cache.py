@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+""" Expiration for any caching policy
+"""
+import heapq
+import threading
+import time
+from itertools import count
+
+
+class TTLCache():
+    """ Adds time-to-live to a cache of any policy.
+
+    `put(key, item, ttl)` stores through the wrapped `cache`; entries
+    expire `ttl` seconds later (`default_ttl` when omitted, never when
+    both are None). `get` treats an expired entry as a miss and deletes
+    it on the spot; `put_many` and `get_many` do the same for batches.
+    Expiry times are also kept in a heap ordered by deadline, so
+    `reap()` frees expired entries nobody reads again by popping only
+    what is due instead of scanning `cache_data`; call it yourself or
+    let `start_reaper()` do it from a daemon thread.
+    Entries the policy evicts or refuses lose their expiry time, and
+    the heap is rebuilt once mostly stale, so both stay within the
+    cache's capacity.
+    `clock` returns seconds and defaults to time.monotonic.
+    """
+    REAP_BATCH = 1000
+
+    def __init__(self, cache, default_ttl=None, clock=None):
+        """ Initialization
+        """
+        if default_ttl is not None and default_ttl <= 0:
+            raise ValueError("default_ttl must be None or positive")
+        self.cache = cache
+        self.default_ttl = default_ttl
+        self.clock = time.monotonic if clock is None else clock
+        self.expiry = {}
+        self._deadlines = []
+        self._tick = count()
+        self._lock = threading.RLock()
+        self._stop = None
+        self._on_evict = cache.on_evict
+        cache.on_evict = self._evicted
+
+    def __getattr__(self, name):
+        """ Everything else (print_cache, memory_usage...) is the
+        wrapped cache's
+        """
+        return getattr(self.__dict__['cache'], name)
+
+    def put(self, key, item, ttl=None):
+        """ Add an item that expires after `ttl` seconds
+        """
+        if key is None or item is None:
+            return
+        ttl = self._checked(ttl)
+        with self._lock:
+            self.cache.put(key, item)
+            self._stamp((key,), ttl)
+
+    def put_many(self, items, ttl=None):
+        """ put() every (key, item) of a mapping or of an iterable of
+        pairs, all expiring after `ttl` seconds, through the wrapped
+        cache's put_many
+        """
+        items = list(items.items() if hasattr(items, 'items') else items)
+        ttl = self._checked(ttl)
+        with self._lock:
+            self.cache.put_many(items)
+            self._stamp([key for key, item in items
+                         if key is not None and item is not None], ttl)
+
+    def _checked(self, ttl):
+        """ The ttl of a put, default_ttl if None
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be None or positive")
+        return ttl
+
+    def _stamp(self, keys, ttl):
+        """ Set the expiry time of keys just put; those the cache did not
+        keep have none. Hold the lock
+        """
+        data, expiry = self.cache.cache_data, self.expiry
+        deadline = None if ttl is None else self.clock() + ttl
+        for key in keys:
+            if deadline is None or key not in data:
+                expiry.pop(key, None)
+                continue
+            expiry[key] = deadline
+            # the tick breaks ties, so keys never have to be ordered
+            heapq.heappush(self._deadlines,
+                           (deadline, next(self._tick), key))
+        if len(self._deadlines) > 2 * len(expiry) + 64:
+            self._deadlines = [(deadline, next(self._tick), key)
+                               for key, deadline in expiry.items()]
+            heapq.heapify(self._deadlines)
+
+    def get(self, key):
+        """ Get an item by key, None once it has expired
+        """
+        with self._lock:
+            deadline = self.expiry.get(key)
+            if deadline is not None and deadline <= self.clock():
+                self._expire(key)
+            # an expired key is gone by now: the cache counts a miss
+            return self.cache.get(key)
+
+    def get_many(self, keys):
+        """ get() every key; return {key: item} for the hits. Runs of
+        keys between expired ones go through the wrapped cache's
+        get_many, and each expired entry is deleted where get() would
+        """
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            now = self.clock()
+            start = 0
+            for i, key in enumerate(keys):
+                deadline = self.expiry.get(key)
+                if deadline is not None and deadline <= now:
+                    for hit in self.cache.get_many(keys[start:i]).items():
+                        found.setdefault(*hit)
+                    self._expire(key)
+                    start = i
+            for hit in self.cache.get_many(keys[start:]).items():
+                found.setdefault(*hit)
+        return found
+
+    def delete(self, key, reason=None):
+        """ Remove an entry; return whether it was there
+        """
+        with self._lock:
+            self.expiry.pop(key, None)
+            return self.cache.delete(key, reason)
+
+    def ttl(self, key):
+        """ Seconds left before `key` expires, None if it never does
+        """
+        with self._lock:
+            deadline = self.expiry.get(key)
+            if deadline is None:
+                return None
+            return max(deadline - self.clock(), 0)
+
+    def _expire(self, key):
+        """ Drop an expired entry; return whether it was in the cache
+        """
+        del self.expiry[key]
+        return self.cache.delete(key, "expired")
+
+    def _evicted(self, key, reason):
+        """ Eviction hook of the wrapped cache: forget the expiry time
+        of entries the policy drops
+        """
+        self.expiry.pop(key, None)
+        if self._on_evict is not None:
+            self._on_evict(key, reason)
+
+    def reap(self, limit=None):
+        """ Remove entries whose deadline has passed, at most `limit`
+        of them; return how many were removed
+        """
+        removed = 0
+        with self._lock:
+            now = self.clock()
+            heap = self._deadlines
+            while heap and heap[0][0] <= now and (limit is None or
+                                                  removed < limit):
+                deadline, _, key = heapq.heappop(heap)
+                # entries re-put since then have a later deadline
+                if self.expiry.get(key) == deadline and self._expire(key):
+                    removed += 1
+        return removed
+
+    def start_reaper(self, interval=1.0):
+        """ Reap every `interval` seconds from a daemon thread
+        """
+        with self._lock:
+            if self._stop is not None:
+                return
+            self._stop = threading.Event()
+        thread = threading.Thread(target=self._reaper,
+                                  args=(self._stop, interval), daemon=True)
+        thread.start()
+
+    def stop_reaper(self):
+        """ Stop the background reaper, if any
+        """
+        with self._lock:
+            stop, self._stop = self._stop, None
+        if stop is not None:
+            stop.set()
+
+    def _reaper(self, stop, interval):
+        """ Background reaping loop, in batches so that readers are
+        never locked out for long
+        """
+        while not stop.wait(interval):
+            while self.reap(self.REAP_BATCH) == self.REAP_BATCH:
+                pass
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+""" 2Q caching module
+"""
+from collections import OrderedDict
+BaseCaching = __import__('base_caching').BaseCaching
+
+
+class TwoQueueCache(BaseCaching):
+    """ Full 2Q (Johnson & Shasha).
+
+    New keys enter a1in, a FIFO holding about a quarter of the cache,
+    and are remembered in a1out (keys only, half the capacity) when
+    they fall out of it. Only a key requested again while in a1out is
+    promoted to am, the LRU holding the rest of the cache, so keys read
+    once by a scan never displace the ones in am.
+    """
+    IN_RATIO = 0.25
+    OUT_RATIO = 0.5
+
+    def __init__(self, capacity=None, max_bytes=None, sizer=None,
+                 on_evict=BaseCaching.print_discard):
+        """ Initialization
+        """
+        super().__init__(capacity, max_bytes, sizer, on_evict)
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.am = OrderedDict()
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+
+        if key in self.cache_data:
+            if key in self.am:
+                self.am.move_to_end(key)
+            self._store(key, item)
+            self._shrink()
+            return
+        size = self._make_room(key, item)
+        if size is None:
+            return
+        self._store(key, item, size)
+        if self.a1out.pop(key, False) is None:
+            self.am[key] = None
+        else:
+            self.a1in[key] = None
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None or key not in self.cache_data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if key in self.am:
+            self.am.move_to_end(key)
+        return self.cache_data[key]
+
+    def _state(self):
+        """ The three queues
+        """
+        return {"a1in": self.a1in, "a1out": self.a1out, "am": self.am}
+
+    def _evict(self):
+        """ Evict the oldest of a1in while it is over its share, else
+        the least recently used of am
+        """
+        if self.a1in and (not self.am or
+                          len(self.a1in) > self._capacity * self.IN_RATIO):
+            key, _ = self.a1in.popitem(last=False)
+            self.a1out[key] = None
+            while len(self.a1out) > max(self._capacity * self.OUT_RATIO, 1):
+                self.a1out.popitem(last=False)
+        else:
+            key, _ = self.am.popitem(last=False)
+        del self.cache_data[key]
+        return key
+
+    def _remove(self, key):
+        """ Forget a key
+        """
+        self.a1in.pop(key, None)
+        self.am.pop(key, None)
+        del self.cache_data[key]
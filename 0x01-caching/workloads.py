@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+""" Access traces shared by the benchmarks and the simulator
+"""
+import os
+import random
+import sys
+
+PAGINATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              os.pardir, '0x00-pagination')
+
+
+def zipf(keys, length, skew=0.9, seed=0):
+    """ `length` accesses over `keys` keys, key k drawn with weight
+    1 / k ** skew: a few hot keys, a long tail """
+    weights = [1 / rank ** skew for rank in range(1, keys + 1)]
+    return random.Random(seed).choices(range(keys), weights, k=length)
+
+
+def scan(keys, length, pages=2000, every=5000):
+    """ `length` Zipf accesses; every `every` of them, `pages` keys
+    ("scan", start, page) that are never read again are read once each
+    """
+    trace = []
+    for start, key in enumerate(zipf(keys, length)):
+        if start % every == every - 1:
+            trace.extend(("scan", start, p) for p in range(pages))
+        trace.append(key)
+    return trace
+
+
+def loop(keys, length):
+    """ The same `keys` keys read in a loop """
+    return [i % keys for i in range(length)]
+
+
+def pagination(length, seed=0):
+    """ Keys of the get_page calls made by a hypermedia pagination
+    Server under browsing sessions: each one picks a page size, starts
+    on a page (the first ones are the most popular) and follows
+    next_page, now and then prev_page, for a few pages """
+    if PAGINATION_DIR not in sys.path:
+        sys.path.append(PAGINATION_DIR)
+    Server = __import__('2-hypermedia_pagination').Server
+    trace = []
+
+    def record(function):
+        """ memoize hook of the Server, recording instead of caching """
+        def wrapper(*args):
+            """ Recorded call """
+            if function.__name__ == 'get_page':
+                trace.append(args)
+            return function(*args)
+        return wrapper
+
+    server = Server(memoize=record)
+    server.DATA_FILE = os.path.join(PAGINATION_DIR, Server.DATA_FILE)
+    rng = random.Random(seed)
+    while len(trace) < length:
+        page_size = rng.choice((10, 10, 10, 20, 50))
+        last = -(-len(server.dataset()) // page_size)
+        page = min(int(rng.paretovariate(0.8)), last)
+        for _ in range(int(rng.expovariate(0.2)) + 1):
+            hyper = server.get_hyper(page, page_size)
+            step = "prev_page" if rng.random() < 0.1 else "next_page"
+            page = hyper[step] or page
+    return trace[:length]
+
+
+def read_trace(path):
+    """ Keys of a trace file: one key per line, a line of several words
+    being a tuple key, and words that are integers ints """
+    def key(line):
+        """ Key of a line """
+        words = [int(word) if word.lstrip('-').isdigit() else word
+                 for word in line.split()]
+        return tuple(words) if len(words) > 1 else words[0]
+
+    with open(path) as f:
+        return [key(line) for line in f if line.strip()]
+
+
+def write_trace(path, trace):
+    """ Save a trace in the format read_trace reads """
+    with open(path, 'w') as f:
+        for key in trace:
+            words = key if isinstance(key, tuple) else (key,)
+            f.write(" ".join(map(str, words)) + "\n")